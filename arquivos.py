@@ -1,10 +1,77 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import numpy as np
+import pandas as pd
 from streamlit_option_menu import option_menu
 
+import conteudo
+from bess import (
+    alarmes, autoconsumo, cache_resultados, decimacao, instrumentacao, simulacao, tarifas, tarefas, tecnologias,
+    telemetria, varredura,
+)
+
+
+# Demanda de carga típica ao longo do dia (MW), com um pico acentuado à noite.
+# Usada pela simulação de Peak Shaving e pela varredura de dimensionamento.
+DEMANDA_EXEMPLO_MW = [
+    80, 75, 70, 65, 68, 80, 100, 110, 120, 130, 135, 140, 
+    138, 142, 150, 160, 180, 250, 255, 252, 248, 180, 150, 110
+]
+# Combinações da varredura desenhadas no gráfico de dispersão; a grade completa fica no download.
+MAX_PONTOS_DISPERSAO = 2000
 
+def tarefa_em_segundo_plano(nome, funcao, *args, **kwargs):
+    """
+    Executa `funcao(*args, **kwargs)` no pool de processos e devolve o resultado quando pronto.
+
+    Enquanto a tarefa roda, mostra uma barra de progresso (atualizada por um fragmento, sem
+    prender o script da página) e devolve None. Se os argumentos mudarem entre execuções da
+    página, a tarefa anterior é cancelada e uma nova é submetida.
+    """
+    gerenciador = tarefas.gerenciador_padrao()
+    chave = cache_resultados.chave(f"{funcao.__module__}.{funcao.__qualname__}", "", *args, **kwargs)
+    chave_sessao = f"tarefa_{nome}"
+
+    anterior = st.session_state.get(chave_sessao)
+    if anterior is not None and anterior[0] != chave:
+        try:
+            gerenciador.cancelar(anterior[1])
+        except KeyError:
+            pass
+        anterior = None
+    if anterior is not None:
+        try:
+            estado = gerenciador.estado(anterior[1])
+        except KeyError: # A tarefa foi descartada (ex.: histórico cheio); submete de novo.
+            anterior = None
+    if anterior is None:
+        st.session_state[chave_sessao] = (chave, gerenciador.submeter(funcao, *args, **kwargs))
+        estado = gerenciador.estado(st.session_state[chave_sessao][1])
+
+    if estado.status == tarefas.CONCLUIDA:
+        return gerenciador.resultado(estado.id)
+    if estado.status == tarefas.ERRO:
+        st.error(f"A simulação falhou: {estado.erro}")
+        return None
+    if estado.status == tarefas.CANCELADA:
+        st.warning("Simulação cancelada. Altere os parâmetros para executá-la novamente.")
+        return None
+
+    _acompanhar_tarefa(estado.id)
+    if st.button("Cancelar simulação", key=f"cancelar_{nome}"):
+        gerenciador.cancelar(estado.id)
+    return None
+
+
+@st.fragment(run_every=1.0)
+def _acompanhar_tarefa(id_tarefa):
+    estado = tarefas.gerenciador_padrao().estado(id_tarefa)
+    if estado.status in tarefas.FINALIZADOS:
+        st.rerun() # Reexecuta a página inteira para exibir o resultado.
+    st.progress(estado.progresso, text=estado.mensagem or "Simulação em andamento...")
+
+
+@instrumentacao.medido()
 def peak_shaving_app():
     """
     Cria a página de simulação de Peak Shaving no Streamlit.
@@ -26,50 +93,34 @@ def peak_shaving_app():
     horas = list(range(24))
     
     # Demanda de carga típica ao longo do dia, com um pico acentuado à noite
-    demanda_total = [
-        80, 75, 70, 65, 68, 80, 100, 110, 120, 130, 135, 140, 
-        138, 142, 150, 160, 180, 250, 255, 252, 248, 180, 150, 110
-    ]
-    
-    # Listas para armazenar os resultados da simulação
-    potencia_bess = []
-    potencia_rede = []
+    demanda_total = DEMANDA_EXEMPLO_MW
     
     potencia_pico_bess = 150 # Potência máxima que o BESS vai fornecer no pico (MW)
 
-    for hora, demanda in zip(horas, demanda_total):
-        # Horário de pico (18:00 às 21:00) -> BESS descarrega
-        if 18 <= hora <= 21:
-            bess_fornece = min(demanda, potencia_pico_bess)
-            potencia_bess.append(bess_fornece)
-            potencia_rede.append(demanda - bess_fornece)
-        # Horário de carga (madrugada, 00:00 às 04:00) -> BESS carrega
-        elif 0 <= hora <= 4:
-            potencia_bess.append(-50) # Carregando com 50 MW (valor negativo)
-            potencia_rede.append(demanda - (-50)) # Rede atende a demanda + carga do BESS
-        # Demais horários -> BESS fica em espera
-        else:
-            potencia_bess.append(0)
-            potencia_rede.append(demanda)
-
-    # Criando o DataFrame com os dados da simulação
-    df_simulacao = pd.DataFrame({
-        'Hora': horas,
-        'Demanda Total (MW)': demanda_total,
-        'Potência da Rede (MW)': potencia_rede,
-        'Potência do BESS (MW)': potencia_bess
-    })
+    # Pico (18:00 às 21:00) -> BESS descarrega; madrugada (00:00 às 04:00) -> BESS carrega com 50 MW.
+    # O resultado fica no cache compartilhado: o cenário é calculado uma vez por servidor.
+    with instrumentacao.medir("peak_shaving: simulação"):
+        df_simulacao = simulacao.simular_peak_shaving(demanda_total, horas, potencia_pico_bess=potencia_pico_bess)
     
     # --- 2. PREPARAÇÃO DOS DADOS PARA O GRÁFICO ---
     
+    # Séries longas são reduzidas a alguns milhares de pontos antes de irem ao navegador.
+    # Com as 24 horas do exemplo a decimação não altera nada.
+    with instrumentacao.medir("peak_shaving: decimação"):
+        df_grafico = decimacao.reduzir(
+            df_simulacao, 'Hora', ['Potência da Rede (MW)', 'Potência do BESS (MW)'],
+            identidade=("peak_shaving", tuple(demanda_total), tuple(horas), potencia_pico_bess),
+        )
+
     # Para o gráfico de área empilhada, usamos o método "melt" do Pandas.
     # Isso transforma as colunas de potência em uma única coluna de "Fonte" e uma de "Valor".
-    df_plot = df_simulacao.melt(
-        id_vars='Hora', 
-        value_vars=['Potência da Rede (MW)', 'Potência do BESS (MW)'],
-        var_name='Fonte de Potência', 
-        value_name='Potência (MW)'
-    )
+    with instrumentacao.medir("peak_shaving: melt"):
+        df_plot = df_grafico.melt(
+            id_vars='Hora', 
+            value_vars=['Potência da Rede (MW)', 'Potência do BESS (MW)'],
+            var_name='Fonte de Potência', 
+            value_name='Potência (MW)'
+        )
     
     # Removemos os valores negativos (carga do BESS) para não exibi-los no gráfico de FORNECIMENTO.
     # A função clip garante que qualquer valor abaixo de 0 se torne 0.
@@ -78,18 +129,19 @@ def peak_shaving_app():
     # --- 3. CRIAÇÃO E EXIBIÇÃO DO GRÁFICO ---
     
     # Usamos Plotly Express para criar o gráfico de área
-    fig = px.area(
-        df_plot, 
-        x='Hora', 
-        y='Potência (MW)', 
-        color='Fonte de Potência',
-        title='Peak Shaving: Fornecimento de Potência (Rede vs. BESS)',
-        labels={'Hora': 'Hora do Dia', 'Potência (MW)': 'Potência Fornecida (MW)'},
-        color_discrete_map={
-            'Potência da Rede (MW)': 'royalblue',
-            'Potência do BESS (MW)': 'firebrick'
-        }
-    )
+    with instrumentacao.medir("peak_shaving: px.area"):
+        fig = px.area(
+            df_plot, 
+            x='Hora', 
+            y='Potência (MW)', 
+            color='Fonte de Potência',
+            title='Peak Shaving: Fornecimento de Potência (Rede vs. BESS)',
+            labels={'Hora': 'Hora do Dia', 'Potência (MW)': 'Potência Fornecida (MW)'},
+            color_discrete_map={
+                'Potência da Rede (MW)': 'royalblue',
+                'Potência do BESS (MW)': 'firebrick'
+            }
+        )
     
     # Ajustes finos no layout do gráfico
     fig.update_layout(
@@ -101,8 +153,116 @@ def peak_shaving_app():
     
     st.plotly_chart(fig, use_container_width=True)
 
+    # --- 4. ECONOMIA NA FATURA (TARIFA HORÁRIA) ---
+    st.subheader("Economia na Fatura de Energia")
+    st.markdown("""
+    Para estimar quanto o Peak Shaving economiza, o mesmo perfil diário é repetido ao longo de um ano e faturado **sem** e **com** o BESS nas modalidades tarifárias horárias do Grupo A:
+    - **Verde:** Uma única tarifa de demanda (R$/kW), cobrada sobre a maior demanda do mês, e energia mais cara no horário de ponta.
+    - **Azul:** Tarifas de demanda separadas para a ponta e a fora de ponta, além da energia por posto horário.
+    
+    O horário de ponta considerado é das 18:00 às 21:00 nos dias úteis. Os valores das tarifas são ilustrativos e não incluem impostos.
+    """)
+    modalidade = st.radio("Modalidade tarifária", ["Verde", "Azul"], horizontal=True)
+    tarifa = tarifas.TARIFAS_EXEMPLO[modalidade.lower()]
+
+    with instrumentacao.medir("peak_shaving: faturamento"):
+        # Potências da simulação em MW -> kW, como nas tarifas.
+        antes = tarifas.repetir_perfil_diario(df_simulacao['Demanda Total (MW)'].to_numpy() * 1000)
+        depois = tarifas.repetir_perfil_diario(df_simulacao['Potência da Rede (MW)'].to_numpy() * 1000)
+        economia = tarifas.economia_mensal(antes, depois, tarifa).droplevel('Consumidor') / 1e6
+        economia.index = economia.index.strftime('%m/%Y')
+
+    col1, col2 = st.columns([2, 1], gap="large")
+    with col1:
+        fig_economia = px.bar(
+            economia.reset_index(), x='Mês', y='Economia (R$)',
+            title=f'Economia Mensal com o BESS (Modalidade {modalidade})',
+            labels={'Economia (R$)': 'Economia (R$ milhões)'},
+            color_discrete_sequence=['seagreen'],
+        )
+        fig_economia.update_layout(title_x=0.2)
+        st.plotly_chart(fig_economia, use_container_width=True)
+    with col2:
+        st.metric("Economia no ano", f"R$ {economia['Economia (R$)'].sum():,.1f} milhões".replace(",", "X").replace(".", ",").replace("X", "."))
+        st.dataframe(economia.round(2).rename(columns=lambda c: c.replace("(R$)", "(R$ mi)")), use_container_width=True)
 
 
+@instrumentacao.medido()
+def varredura_bess_app():
+    """
+    Cria a seção de varredura de parâmetros (dimensionamento do BESS) no Streamlit.
+    """
+    st.header("Dimensionamento do BESS: Varredura de Parâmetros")
+    st.markdown("""
+    Quanto de potência (MW) e de energia (MWh) é preciso para reduzir o pico de demanda? A varredura abaixo simula o mesmo perfil de carga do Peak Shaving para **todas as combinações** de potência, capacidade, eficiência e limiar de demanda escolhidas.
+    
+    - **Limiar:** O BESS descarrega sempre que a demanda ultrapassa o limiar e recarrega com a folga abaixo dele.
+    - **Fronteira de Pareto:** Combinações para as quais nenhuma outra, com custo menor ou igual, reduz mais o pico.
+    """)
+
+    col1, col2 = st.columns(2, gap="large")
+    with col1:
+        potencias = st.slider("Potência do BESS (MW)", 0, 300, (0, 200), step=10)
+        energias = st.slider("Capacidade do BESS (MWh)", 0, 1200, (0, 800), step=50)
+        n_pontos = st.select_slider("Pontos por eixo (potência, capacidade e limiar)", options=[5, 10, 15, 20, 25, 30], value=20)
+    with col2:
+        eficiencias = st.multiselect("Eficiência de ida e volta", [0.80, 0.85, 0.90, 0.95], default=[0.85, 0.90, 0.95])
+        limiares = st.slider("Limiar de demanda (MW)", 100, 260, (150, 250), step=5)
+        custo_potencia = st.number_input("CAPEX de potência (R$ milhões/MW)", min_value=0.0, value=1.2, step=0.1)
+        custo_energia = st.number_input("CAPEX de energia (R$ milhões/MWh)", min_value=0.0, value=1.5, step=0.1)
+
+    if not eficiencias:
+        st.warning("Selecione ao menos um valor de eficiência.")
+        return
+
+    # A varredura roda no pool de processos; a página só acompanha o progresso.
+    resultado = tarefa_em_segundo_plano(
+        "varredura", varredura.varrer, DEMANDA_EXEMPLO_MW,
+        np.linspace(*potencias, n_pontos), np.linspace(*energias, n_pontos),
+        sorted(eficiencias), np.linspace(*limiares, n_pontos),
+        custo_potencia=custo_potencia, custo_energia=custo_energia,
+    )
+    if resultado is None:
+        return
+    st.caption(f"{len(resultado):,} combinações avaliadas.".replace(",", "."))
+
+    pareto = resultado[resultado['Pareto']].sort_values('Custo (R$ mi)')
+    tab_pareto, tab_mapa = st.tabs(["Custo vs. Redução de Pico", "Mapa de Calor (MW x MWh)"])
+
+    with tab_pareto:
+        # Uma amostra fixa das combinações, para o gráfico não crescer com a grade.
+        amostra = resultado.sample(min(len(resultado), MAX_PONTOS_DISPERSAO), random_state=0)
+        fig = px.scatter(
+            amostra, x='Custo (R$ mi)', y='Redução de Pico (MW)',
+            color_discrete_sequence=['lightgray'], opacity=0.5,
+            title='Custo vs. Redução de Pico' + (' (amostra das combinações)' if len(amostra) < len(resultado) else ''),
+            hover_data=varredura.COLUNAS_PARAMETROS,
+        )
+        fig.add_scatter(
+            x=pareto['Custo (R$ mi)'], y=pareto['Redução de Pico (MW)'],
+            mode='lines+markers', name='Fronteira de Pareto', line=dict(color='firebrick'),
+        )
+        fig.update_layout(title_x=0.2)
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(pareto[varredura.COLUNAS_PARAMETROS + ['Redução de Pico (MW)', 'Custo (R$ mi)']], use_container_width=True, hide_index=True)
+        st.download_button(
+            "Baixar todas as combinações (CSV)", lambda: resultado.to_csv(index=False),
+            file_name="varredura_bess.csv", mime="text/csv", key="varredura_csv",
+        )
+
+    with tab_mapa:
+        # Para cada par (MW, MWh), a melhor redução entre as eficiências e limiares testados.
+        mapa = resultado.pivot_table(index='Energia (MWh)', columns='Potência (MW)', values='Redução de Pico (MW)', aggfunc='max')
+        fig = px.imshow(
+            mapa, origin='lower', aspect='auto', color_continuous_scale='Viridis',
+            labels={'color': 'Redução de Pico (MW)'},
+            title='Melhor Redução de Pico por Potência e Capacidade',
+        )
+        fig.update_layout(title_x=0.2)
+        st.plotly_chart(fig, use_container_width=True)
+
+
+@instrumentacao.medido()
 def bms():
     # --- PÁGINA: ANÁLISE DETALHADA DO BMS ---
     st.header("BMS (Battery Management System): O Guardião das Baterias")
@@ -142,6 +302,17 @@ def bms():
         4.  **Curto-Circuito Interno:** O separador entre o ânodo e o cátodo derrete, causando um curto-circuito massivo.
         5.  **Fogo e Explosão:** As altas temperaturas e os gases inflamáveis podem levar à ignição.
     """)
+
+    with st.expander("Detecção Antecipada: Teste de Regras de Alarme em um Registro Histórico"):
+        st.markdown("""
+        Os gatilhos acima aparecem na telemetria antes do evento: uma célula que aquece mais rápido que as vizinhas, uma tensão que se afasta da média do módulo. O motor de alarmes avalia três tipos de regra a cada amostra:
+        - **Limite:** Sobretensão, subtensão, sobretemperatura.
+        - **Taxa de variação:** Aquecimento rápido (°C/s) ao longo de uma janela.
+        - **Desvio:** Distância da tensão média de cada célula para a média do seu módulo.
+
+        Abaixo, uma hora de registro (64 células a 1 Hz) em que a célula 5 entra em aquecimento descontrolado e a célula 9 se desbalanceia aos poucos é reproduzida com as regras escolhidas.
+        """)
+        _teste_alarmes()
     # --- PÁGINA: BMS - BALANCEAMENTO ---
     st.header("BMS: Métodos de Balanceamento de Células")
     st.markdown("O balanceamento é uma função crítica do BMS para garantir um Estado de Carga (SoC) uniforme entre todas as células, o que maximiza a capacidade utilizável e a vida útil da bateria. Existem duas abordagens principais: **Passiva** e **Ativa**.")
@@ -162,10 +333,7 @@ def bms():
         """)
 
         st.write(" ")
-        st.dataframe(pd.DataFrame({
-            "Vantagens 👍": ["Simplicidade do circuito", "Menor custo", "Fácil de projetar"],
-            "Desvantagens 👎": ["Desperdício de energia (calor)", "Pode afetar células vizinhas com o calor gerado", "Menos eficiente"]
-        }), use_container_width=True)
+        st.dataframe(conteudo.tabela("bms.balanceamento_passivo"), use_container_width=True)
         st.caption("Baseado na tabela da pág. 35 do documento. ")
         
     with col2:
@@ -180,10 +348,7 @@ def bms():
         """)
 
         st.write(" ")
-        st.dataframe(pd.DataFrame({
-        "Vantagens 👍": ["Alta eficiência energética", "Maximiza o uso da capacidade", "Balanceamento mais rápido", "Melhora a vida útil"],
-        "Desvantagens 👎": ["Circuitos mais complexos", "Custo de fabricação mais alto", "Maior dificuldade na construção", ""] # <-- Adicionado item vazio para igualar o tamanho
-        }), use_container_width=True)
+        st.dataframe(conteudo.tabela("bms.balanceamento_ativo"), use_container_width=True)
         st.caption("Baseado na tabela da pág. 75 do documento. ")
 
 
@@ -244,6 +409,7 @@ def bms():
         ''')
         st.caption("Onde $P_{max}(t)$ é a potência de pico e $P_{nominal}(t)$ é a potência nominal.")
 
+@instrumentacao.medido()
 def pcs():
     # --- PÁGINA: PCS - CONVERSÃO DE POTÊNCIA ---
     st.header("PCS (Power Conversion System)")
@@ -273,11 +439,14 @@ def pcs():
         - Pelo menos uma fonte na microrrede (geralmente um BESS ou gerador síncrono) deve ter essa capacidade.
         """)
 
+@instrumentacao.medido()
 def ems():
     st.markdown("""Em produção""")
 
 
+@instrumentacao.medido()
 def introducao_armazenamento():
+    st.warning("Esta seção é ideal para textos explicativos, imagens e diagramas.")
     # --- PÁGINA: INTRODUÇÃO AO ARMAZENAMENTO DE ENERGIA ---
     st.header("Tecnologias de Armazenamento de Energia")
     st.markdown("Esta seção aborda os conceitos fundamentais e as diversas tecnologias utilizadas para armazenar energia, um componente crucial para a estabilidade e eficiência das redes elétricas modernas.")
@@ -497,8 +666,18 @@ def introducao_armazenamento():
             - **Supercapacitores (Ultracapacitores):** Armazenam energia em um campo elétrico. Possuem capacidade de armazenamento limitada, mas podem carregar/descarregar quase instantaneamente com altíssima potência e suportam milhões de ciclos. Ideais para aplicações de resposta rápida.
             - **Armazenamento Magnético Supercondutor (SMES):** Armazena energia em um campo magnético gerado por uma corrente em uma bobina supercondutora. Apresenta eficiência altíssima e resposta instantânea, mas requer resfriamento criogênico, o que consome energia e eleva o custo.
             """)
+
+    st.subheader("4. Comparação Quantitativa: Custo Nivelado do Armazenamento (LCOS)")
+    st.markdown("""
+    As tecnologias acima diferem em eficiência, autodescarga, velocidade de resposta e, principalmente, em quanto custa cada MW e cada MWh. Abaixo, **o mesmo perfil de arbitragem diária** (carga de 100 MW na madrugada, descarga de 100 MW no pico da noite, por uma semana) é aplicado a centenas de variantes de tecnologia, potência e duração, e cada uma é comparada pelo **LCOS** (custo por MWh efetivamente entregue).
+    - **Desacoplamento energia/potência:** Em UHER, CAES, baterias de fluxo e hidrogênio, a energia (reservatório, caverna, tanques) é barata e escala separadamente da potência, o que favorece longas durações.
+    - **Atendimento:** Fração da energia pedida que a variante conseguiu entregar; variantes subdimensionadas têm LCOS baixo, mas não cumprem o perfil.
+    """)
+    _comparacao_tecnologias()
+    st.caption("Parâmetros indicativos (ordem de grandeza da literatura), úteis para comparar as tecnologias entre si, não para orçar projetos.")
             
 
+@instrumentacao.medido()
 def elementos_bess():
     # --- PÁGINA: ELEMENTOS CONSTITUINTES DO BESS ---
     st.header("BESS: Elementos Constituintes e Funções")
@@ -534,6 +713,13 @@ def elementos_bess():
         """)
         st.image("img/10int1.png", caption="Arquitetura detalhada do sistema de gerenciamento de baterias (BMS)", width = 700)
 
+    with st.expander("Telemetria da Frota: Resumos por Módulo, Rack e Contêiner"):
+        st.markdown("""
+        Cada BMU reporta tensão, temperatura e SoC de suas células cerca de uma vez por segundo. Em uma frota com dezenas de contêineres, são **~100 mil células por segundo**, e o que o operador acompanha são os resumos por nível: a célula mais quente de cada rack, a dispersão de SoC de cada módulo (o "Efeito Barril"), o desvio de tensão que indica necessidade de balanceamento.
+        O exemplo abaixo agrega uma frota sintética de 10 contêineres x 12 racks x 16 módulos x 52 células, com um rack mais quente e mais desbalanceado que os demais.
+        """)
+        _telemetria_frota()
+
     with st.expander("Desafios de Operação: O 'Efeito Barril'"):
         st.markdown("""
         Quando múltiplas células ou racks são conectados, pequenas diferenças em suas características (como impedância interna) podem levar a um desequilíbrio.
@@ -591,6 +777,7 @@ def elementos_bess():
         """)
 
 
+@instrumentacao.medido()
 def pcs_detalhado():
     # --- PÁGINA: ANÁLISE DETALHADA DO PCS ---
     st.header("Análise Detalhada do PCS (Power Conversion System)")
@@ -698,6 +885,7 @@ def pcs_detalhado():
     - **Perdas em Sistemas Auxiliares:** Energia consumida pelos próprios sistemas de controle, refrigeração do PCS, ventilação, etc.
     """)
 
+@instrumentacao.medido()
 def microredes():
     # --- PÁGINA: MICRORREDES ---
     st.header("Microrredes: O Futuro da Resiliência Energética")
@@ -776,6 +964,176 @@ def microredes():
     """)
     st.image("img/165int2.png", caption="Diagrama unifilar da Microrrede de exemplo", width = 500)
 
+@cache_resultados.resultado_cacheado(versao="1")
+def _reproduzir_alarmes(maximo_temperatura, maximo_taxa, maximo_desvio):
+    # Registro sintético de 1 h: a célula 5 entra em fuga térmica e a célula 9 se desbalanceia.
+    rng = np.random.default_rng(0)
+    n_amostras, n_celulas = 3600, 64
+    tensao = 3.3 + rng.normal(0, 0.005, (n_amostras, n_celulas))
+    temperatura = 28 + rng.normal(0, 0.1, (n_amostras, n_celulas))
+    temperatura[1800:, 5] += np.minimum(np.arange(n_amostras - 1800) * 0.8, 60)
+    tensao[1000:, 9] += np.linspace(0, 0.1, n_amostras - 1000)
+
+    regras = [
+        alarmes.Limite("Sobretensão", "tensao", maximo=3.65, histerese=0.05),
+        alarmes.Limite("Sobretemperatura", "temperatura", maximo=maximo_temperatura, histerese=5.0),
+        alarmes.Taxa("Aquecimento rápido", "temperatura", maximo_por_s=maximo_taxa, janela=10.0, histerese=0.3 * maximo_taxa),
+        alarmes.Desvio("Desbalanceamento de tensão", "tensao", maximo=maximo_desvio, janela=30.0, histerese=0.2 * maximo_desvio),
+    ]
+    eventos, velocidade = alarmes.reproduzir(
+        {'tensao': tensao, 'temperatura': temperatura}, regras, grupos=np.arange(n_celulas) // 16
+    )
+    curvas = {'Célula 5': temperatura[:, 5], 'Média das demais': np.delete(temperatura, 5, axis=1).mean(axis=1)}
+    return eventos, velocidade, curvas
+
+
+def _teste_alarmes():
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        maximo_temperatura = st.slider("Sobretemperatura (°C)", 40, 80, 55, key="alarme_temperatura")
+    with col2:
+        maximo_taxa = st.slider("Aquecimento rápido (°C/s)", 0.1, 2.0, 0.5, step=0.1, key="alarme_taxa")
+    with col3:
+        maximo_desvio = st.slider("Desvio de tensão (mV)", 10, 100, 50, step=5, key="alarme_desvio") / 1000
+    with instrumentacao.medir("bms: reprodução de alarmes"):
+        eventos, velocidade, curvas = _reproduzir_alarmes(maximo_temperatura, maximo_taxa, maximo_desvio)
+
+    df_curvas = decimacao.reduzir(
+        pd.DataFrame({'Tempo (s)': np.arange(len(curvas['Célula 5'])), **curvas}), 'Tempo (s)', list(curvas),
+        identidade=("alarmes", maximo_temperatura, maximo_taxa, maximo_desvio),
+    )
+    fig = px.line(
+        df_curvas, x='Tempo (s)', y=['Célula 5', 'Média das demais'],
+        title='Temperatura das células e alarmes ativados', labels={'value': 'Temperatura (°C)', 'variable': ''},
+    )
+    for _, evento in eventos[eventos['Evento'] == alarmes.ATIVADO].iterrows():
+        fig.add_vline(x=evento['Instante'], line_dash='dot', line_color='firebrick')
+    fig.update_layout(title_x=0.2)
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"Registro de 1 h reproduzido {velocidade:,.0f}x mais rápido que o tempo real.".replace(",", "."))
+    st.dataframe(eventos, use_container_width=True, hide_index=True)
+
+
+def _telemetria_frota():
+    topologia = telemetria.Topologia.regular(10, 12, 16, 52)
+    rng = np.random.default_rng(7)
+    n = topologia.n_celulas
+    tensao = rng.normal(3.30, 0.01, n)
+    temperatura = rng.normal(28, 1.5, n)
+    soc = rng.normal(0.60, 0.01, n)
+    # Um rack com problema de refrigeração e células desbalanceadas (contêiner 3, rack 5).
+    problema = slice((3 * 12 + 5) * 16 * 52, (3 * 12 + 6) * 16 * 52)
+    temperatura[problema] += rng.uniform(5, 15, 16 * 52)
+    soc[problema] += rng.normal(0, 0.05, 16 * 52)
+    tensao[problema] += rng.normal(0, 0.03, 16 * 52)
+
+    frota = telemetria.Telemetria(topologia)
+    frota.atualizar(tensao, temperatura, soc)
+    racks = frota.tabela("rack")
+
+    grandeza = st.selectbox(
+        "Grandeza por rack", ['Temperatura Máx (°C)', 'Dispersão de SoC', 'Desvio de Tensão (V)', 'SoC Médio'],
+        key="telemetria_grandeza",
+    )
+    mapa = racks[grandeza].unstack('Rack')
+    fig = px.imshow(
+        mapa, aspect='auto', color_continuous_scale='Inferno', labels={'color': grandeza},
+        title=f'{grandeza} por rack ({n:,} células)'.replace(",", "."),
+    )
+    fig.update_layout(title_x=0.2)
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(frota.tabela("container"), use_container_width=True)
+
+
+def _comparacao_tecnologias():
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        atendimento_min = st.slider("Atendimento mínimo do perfil (%)", 50, 100, 95, step=5, key="lcos_atendimento")
+    with col2:
+        taxa_desconto = st.slider("Taxa de desconto (% a.a.)", 2, 15, 8, key="lcos_taxa") / 100
+    with col3:
+        preco_carga = st.number_input("Preço da energia de carga (US$/MWh)", min_value=0.0, value=40.0, step=5.0, key="lcos_preco")
+    escolhidas = st.multiselect("Tecnologias", list(tecnologias.TECNOLOGIAS), default=list(tecnologias.TECNOLOGIAS), key="lcos_tecnologias")
+    if not escolhidas:
+        st.warning("Selecione ao menos uma tecnologia.")
+        return
+
+    resultado = tecnologias.comparar(
+        tecnologias.perfil_arbitragem(100), np.linspace(25, 200, 8), [0.25, 0.5, 1, 2, 4, 6, 8, 12, 24, 48, 168],
+        escolhidas, taxa_desconto=taxa_desconto, preco_carga=preco_carga,
+    )
+    viaveis = resultado[resultado['Atendimento (%)'] >= atendimento_min]
+    if viaveis.empty:
+        st.warning("Nenhuma variante atende o perfil com esse nível de atendimento.")
+        return
+    melhores = viaveis.loc[viaveis.groupby('Tecnologia')['LCOS (US$/MWh)'].idxmin()].sort_values('LCOS (US$/MWh)')
+    st.caption(f"{len(resultado)} variantes avaliadas, {len(viaveis)} atendem o perfil.")
+
+    tab_ranking, tab_variantes = st.tabs(["Melhor Variante por Tecnologia", "Todas as Variantes"])
+    with tab_ranking:
+        fig = px.bar(
+            melhores, x='Tecnologia', y='LCOS (US$/MWh)', color='Tecnologia',
+            hover_data=['Potência (MW)', 'Duração (h)', 'Atendimento (%)', 'CAPEX (US$ mi)'],
+            title='Menor LCOS de cada tecnologia',
+        )
+        fig.update_layout(title_x=0.2, showlegend=False)
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(
+            melhores[['Tecnologia', 'Potência (MW)', 'Duração (h)', 'Atendimento (%)', 'Ciclos/ano', 'Vida Efetiva (anos)', 'CAPEX (US$ mi)', 'LCOS (US$/MWh)']],
+            use_container_width=True, hide_index=True,
+        )
+    with tab_variantes:
+        fig = px.scatter(
+            viaveis, x='Duração (h)', y='LCOS (US$/MWh)', color='Tecnologia', size='Potência (MW)', log_x=True,
+            hover_data=['Potência (MW)', 'Atendimento (%)', 'CAPEX (US$ mi)'],
+            title='LCOS por duração (variantes que atendem o perfil)',
+        )
+        fig.update_layout(title_x=0.2)
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def _grafico_autoconsumo():
+    # Um dia típico de um consumidor com 6 kWp de FV e um BESS de 5 kW / 10 kWh, em passos de 15 min.
+    horas = np.arange(96) / 4
+    geracao_fv = 6 * np.clip(np.sin((horas - 6) / 12 * np.pi), 0, None)
+    carga = 0.8 + 0.6 * np.exp(-((horas - 8) / 1.5) ** 2) + 2.2 * np.exp(-((horas - 19.5) / 2) ** 2)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        soc_reserva = st.slider("Reserva de backup (SoC)", 0.0, 0.8, 0.2, step=0.05, key="autoconsumo_reserva")
+    with col2:
+        limite_exportacao = st.slider("Limite de exportação (kW)", 0.0, 6.0, 2.0, step=0.5, key="autoconsumo_exportacao")
+    parametros = autoconsumo.ParametrosAutoconsumo(
+        potencia_kw=5, energia_kwh=10, soc_reserva=soc_reserva, soc_inicial=soc_reserva, limite_exportacao_kw=limite_exportacao
+    )
+    fluxos, resumo = autoconsumo.simular_autoconsumo(carga, geracao_fv, parametros)
+
+    series = ['Carga (kW)', 'Geração FV (kW)', 'BESS (kW)', 'Importação da Rede (kW)', 'Corte (kW)']
+    df_fluxos = decimacao.reduzir(
+        pd.DataFrame({
+            'Hora': horas,
+            'Carga (kW)': carga,
+            'Geração FV (kW)': geracao_fv,
+            'BESS (kW)': fluxos['BESS (kW)'][:, 0],
+            'Importação da Rede (kW)': fluxos['Importação (kW)'][:, 0],
+            'Corte (kW)': fluxos['Corte (kW)'][:, 0],
+        }), 'Hora', series,
+        identidade=("autoconsumo", soc_reserva, limite_exportacao),
+    )
+    fig = px.line(
+        df_fluxos, x='Hora', y=series,
+        title='Autoconsumo FV com BESS (BESS positivo = descarga)',
+        labels={'value': 'Potência (kW)', 'variable': 'Fluxo'},
+    )
+    fig.update_layout(title_x=0.2, xaxis=dict(tickmode='linear', dtick=2, title_text='Hora do Dia'))
+    st.plotly_chart(fig, use_container_width=True)
+
+    metrica1, metrica2 = st.columns(2)
+    metrica1.metric("Autoconsumo da geração FV", f"{resumo['Autoconsumo FV (%)'].iloc[0]:.0f}%")
+    metrica2.metric("Autossuficiência", f"{resumo['Autossuficiência (%)'].iloc[0]:.0f}%")
+
+
+@instrumentacao.medido()
 def aplicacoes_bess():
     # --- PÁGINA: APLICAÇÕES DO BESS ---
     st.header("Aplicações e Serviços do BESS")
@@ -855,6 +1213,7 @@ def aplicacoes_bess():
         with st.container(border=True):
             st.markdown("#### Aumento do Autoconsumo Fotovoltaico")
             st.markdown("Armazena a energia solar gerada durante o dia que não foi consumida na hora, para que possa ser utilizada à noite. Isso maximiza o aproveitamento da energia gerada e reduz a dependência da rede.")
+            _grafico_autoconsumo()
 
         with st.container(border=True):
             st.markdown("#### Backup Power (Energia de Emergência / Nobreak)")
@@ -885,3 +1244,139 @@ def aplicacoes_bess():
     - **Crescimento:** O principal fator que impulsiona o mercado é a contínua redução de custos das baterias de lítio, que, segundo projeções, tornará o armazenamento financeiramente viável para milhares de consumidores comerciais e industriais nos próximos anos.
     """)
 
+
+@instrumentacao.medido()
+def pagina_inicial():
+    # --- PÁGINA INICIAL ---
+    st.title("🔋 Análise e Informações sobre BESS")
+    st.markdown("---")
+    st.markdown("""
+    Bem-vindo ao seu painel de informações sobre **Sistemas de Armazenamento de Energia por Baterias (BESS)**.
+    
+    Este é um ambiente interativo criado com Streamlit para consolidar conhecimentos, análises e dados sobre BESS.
+    
+    **Navegue pelo menu à esquerda para explorar as seções:**
+    - **O que é BESS?:** Uma introdução conceitual.
+    - **Aplicações e Gráficos:** Veja casos de uso e analise dados interativos.
+    - **Equações e Código:** Explore os modelos matemáticos e códigos de simulação por trás da tecnologia.
+    """)
+    st.image("bess_foto.png", caption="BESS", width = 500)
+
+    st.header("O que é um Sistema de Armazenamento de Energia por Baterias (BESS)?")
+    st.markdown("""
+    Um BESS é uma solução tecnológica que utiliza baterias recarregáveis para armazenar energia elétrica e disponibilizá-la posteriormente. 
+    Ele é composto por três componentes principais:
+    
+    1.  **Baterias:** O coração do sistema, onde a energia é quimicamente armazenada.
+    2.  **Sistema de Gerenciamento de Bateria (BMS - Battery Management System):** Garante a operação segura e eficiente das baterias, monitorando tensão, corrente e temperatura.
+    3.  **Conversor de Potência (PCS - Power Conversion System):** Converte a corrente contínua (CC) das baterias em corrente alternada (CA) para a rede elétrica, e vice-versa.
+    """)
+
+
+@instrumentacao.medido()
+def equacoes_codigo():
+    # --- PÁGINA: EQUAÇÕES E CÓDIGO ---
+    st.header("Equações Fundamentais e Códigos de Simulação")
+    
+    st.subheader("Equação do Estado de Carga (State of Charge - SoC)")
+    st.markdown("""
+    Uma das equações mais importantes para um BESS é a que descreve seu estado de carga. A forma mais simples (desconsiderando perdas complexas) é a integração da potência ao longo do tempo.
+    
+    Abaixo, a equação em formato LaTeX:
+    """)
+    # Usando st.latex para renderizar equações matemáticas
+    st.latex(r'''
+    SoC(t) = SoC(t_0) + \frac{1}{C_{rated}} \int_{t_0}^{t} \eta \cdot P_{bateria}(\tau) d\tau
+    ''')
+    st.markdown(r'''
+    Onde:
+    - $SoC(t)$ é o estado de carga no tempo $t$.
+    - $C_{rated}$ é a capacidade nominal da bateria (ex: em MWh).
+    - $P_{bateria}(\tau)$ é a potência da bateria no tempo $\tau$ (positiva para carga, negativa para descarga).
+    - $\eta$ é a eficiência de carga/descarga.
+    ''')
+
+    st.markdown("---")
+    
+    st.subheader("Exemplo de Código Python")
+    st.markdown("A seguir, um exemplo de uma função Python simples que poderia ser usada para simular a variação do SoC.")
+    
+    # Usando st.code para exibir um bloco de código
+    codigo_python = """
+def simular_soc(soc_inicial, potencia, duracao_horas, capacidade_mwh, eficiencia=0.9):
+    '''
+    Simula a variação do Estado de Carga de uma bateria.
+    
+    Args:
+    - soc_inicial (float): Estado de carga inicial (entre 0 e 1).
+    - potencia (float): Potência de carga (+) ou descarga (-) em MW.
+    - duracao_horas (float): Duração da operação em horas.
+    - capacidade_mwh (float): Capacidade total da bateria em MWh.
+    - eficiencia (float): Eficiência de ida e volta.
+    
+    Returns:
+    - float: Novo estado de carga.
+    '''
+    
+    # Aplica eficiência (perdas)
+    if potencia > 0: # Carregando
+        potencia_efetiva = potencia * eficiencia
+    else: # Descarregando
+        potencia_efetiva = potencia / eficiencia
+        
+    energia_transacionada = potencia_efetiva * duracao_horas
+    variacao_soc = energia_transacionada / capacidade_mwh
+    
+    soc_final = soc_inicial + variacao_soc
+    
+    # Garante que o SoC fique entre 0 e 1
+    return max(0, min(1, soc_final))
+
+# Exemplo de uso:
+soc_novo = simular_soc(soc_inicial=0.5, potencia=-10, duracao_horas=2, capacidade_mwh=50)
+print(f"O novo Estado de Carga é: {soc_novo*100:.2f}%")
+    """
+    st.code(codigo_python, language='python')
+
+
+# Seções de cada página do menu, na ordem em que aparecem.
+PAGINAS = {
+    "Página Inicial": [pagina_inicial, elementos_bess, introducao_armazenamento],
+    "BMS": [bms],
+    "PCS": [pcs, pcs_detalhado],
+    "EMS": [ems],
+    "Micro-redes": [microredes],
+    "Aplicações e Gráficos": [aplicacoes_bess, peak_shaving_app, varredura_bess_app],
+    "Equações e Código": [equacoes_codigo],
+}
+
+# Seções que dependem de uma sessão ao vivo (simulações em segundo plano, resultados
+# por sessão). Na exportação estática (`exportar.py`), viram um link para o app.
+INTERATIVAS = {
+    peak_shaving_app: "Simulação de Peak Shaving: despacho do BESS no horário de ponta e economia na fatura de energia.",
+    varredura_bess_app: "Dimensionamento do BESS: varredura de potência, capacidade, eficiência e limiar, com a fronteira de Pareto.",
+}
+
+
+def painel_perfil():
+    """
+    Painel lateral com o perfil da execução atual da página (apenas com BESS_PERFIL=1).
+    """
+    total_ms = instrumentacao.duracao_execucao_ms()
+    eventos = sorted(instrumentacao.eventos_execucao(), key=lambda e: e["inicio_ms"])
+    secoes_ms = sum(e["duracao_ms"] for e in eventos if e["nivel"] == 0)
+
+    with st.sidebar.expander("⏱️ Perfil da Página", expanded=True):
+        st.metric("Tempo total do script", f"{total_ms:.1f} ms")
+        st.caption(f"Trechos medidos: {secoes_ms:.1f} ms · Restante (Streamlit, menu e texto fora das seções): {total_ms - secoes_ms:.1f} ms")
+        if eventos:
+            st.dataframe({
+                "Trecho": ["· " * e["nivel"] + e["nome"] for e in eventos],
+                "Duração (ms)": [round(e["duracao_ms"], 2) for e in eventos],
+            }, use_container_width=True, hide_index=True)
+        contadores = instrumentacao.contadores()
+        if contadores:
+            st.caption("Contadores do processo (todas as sessões)")
+            st.dataframe({"Contador": list(contadores), "Valor": list(contadores.values())}, use_container_width=True, hide_index=True)
+        st.download_button("Baixar trace (Chrome/Perfetto)", instrumentacao.trace_chrome(), file_name="bess_trace.json", mime="application/json")
+        st.download_button("Baixar métricas (OpenMetrics)", instrumentacao.openmetrics(), file_name="bess_metricas.txt", mime="application/openmetrics-text")
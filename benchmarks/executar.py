@@ -0,0 +1,208 @@
+"""
+Benchmarks do projeto: núcleos de simulação, inicialização e renderização das páginas.
+
+Uso (a partir da raiz do repositório):
+
+    python benchmarks/executar.py                      # roda tudo e grava o JSON
+    python benchmarks/executar.py --tamanhos 24 8760   # só alguns tamanhos de série
+    python benchmarks/executar.py --comparar antigo.json novo.json
+
+Os resultados ficam em `benchmarks/resultados/<commit>.json`, para comparar commits
+e acompanhar as curvas de escala (tempo vs. nº de amostras) de cada núcleo.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+# Um cache vazio e exclusivo para o benchmark: cada execução parte do mesmo estado.
+os.environ["BESS_CACHE_DIR"] = tempfile.mkdtemp(prefix="bess-bench-")
+
+import numpy as np  # noqa: E402
+
+TAMANHOS = [24, 8760, 525600, 5_000_000]
+PAGINAS = ["Página Inicial", "BMS", "PCS", "EMS", "Micro-redes", "Aplicações e Gráficos", "Equações e Código"]
+
+
+def _cronometrar(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return {"repeticoes": repeticoes, "segundos_min": min(tempos), "segundos_mediana": statistics.median(tempos)}
+
+
+def _repeticoes(n_amostras):
+    # Séries pequenas repetem mais para reduzir o ruído; as grandes, uma vez basta.
+    return 50 if n_amostras <= 10_000 else 5 if n_amostras <= 1_000_000 else 1
+
+
+def benchmark_nucleos(tamanhos):
+    from bess import simulacao
+
+    rng = np.random.default_rng(0)
+    resultados = []
+    for n in tamanhos:
+        horas = np.arange(n) % 24
+        demanda = 150 + 100 * np.sin(2 * np.pi * horas / 24) + rng.normal(0, 10, n)
+        potencia = rng.normal(0, 20, n)
+        casos = {
+            "peak_shaving_janelas": lambda: simulacao.simular_peak_shaving.sem_cache(demanda, horas),
+            "despacho_limiar_soc": lambda: simulacao.despachar(demanda, 50, 200, 0.9, 200),
+            "soc": lambda: simulacao.simular_soc(potencia, 50),
+        }
+        for nome, funcao in casos.items():
+            resultado = {"nome": nome, "amostras": n, **_cronometrar(funcao, _repeticoes(n))}
+            resultados.append(resultado)
+            print(f"  {nome:<24} {n:>10,} amostras  {resultado['segundos_min'] * 1e3:10.2f} ms")
+    return resultados
+
+
+def _tempo_subprocesso(codigo):
+    inicio = time.perf_counter()
+    saida = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+    return time.perf_counter() - inicio, saida.stdout
+
+
+def benchmark_inicializacao(repeticoes=3):
+    """Importação de `arquivos` e execução a frio de `streamlit_app.py`, em processos novos."""
+    codigo_import = "import time; t = time.perf_counter(); import arquivos; print(time.perf_counter() - t)"
+    codigo_app = (
+        "import time, runpy; t = time.perf_counter(); "
+        "runpy.run_path('streamlit_app.py', run_name='__main__'); print(time.perf_counter() - t)"
+    )
+    resultados = {}
+    for nome, codigo in (("import_arquivos", codigo_import), ("cold_start_streamlit_app", codigo_app)):
+        internos, totais = [], []
+        for _ in range(repeticoes):
+            total, saida = _tempo_subprocesso(codigo)
+            internos.append(float(saida.strip().splitlines()[-1]))
+            totais.append(total)
+        resultados[nome] = {
+            "repeticoes": repeticoes,
+            "segundos_mediana": statistics.median(internos),
+            "segundos_processo_mediana": statistics.median(totais),
+        }
+        print(f"  {nome:<28} {resultados[nome]['segundos_mediana'] * 1e3:10.2f} ms "
+              f"(processo: {resultados[nome]['segundos_processo_mediana'] * 1e3:.0f} ms)")
+    return resultados
+
+
+def _script_pagina(pagina):
+    # O option_menu é um componente do navegador; no AppTest ele é trocado pela página desejada.
+    import runpy
+
+    import streamlit_option_menu
+    streamlit_option_menu.option_menu = lambda *args, **kwargs: pagina
+    runpy.run_path("streamlit_app.py", run_name="__main__")
+
+
+def benchmark_paginas(repeticoes=5):
+    """Execução do script de cada página com o `AppTest` do Streamlit (sem navegador)."""
+    from streamlit.testing.v1 import AppTest
+
+    from bess import tarefas
+
+    resultados = []
+    for pagina in PAGINAS:
+        app = AppTest.from_function(_script_pagina, args=(pagina,), default_timeout=120)
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            app.run()
+            tempos.append(time.perf_counter() - inicio)
+            if app.exception:
+                raise RuntimeError(f"Página {pagina!r} falhou: {app.exception[0].value}")
+        resultado = {
+            "pagina": pagina,
+            "repeticoes": repeticoes,
+            "segundos_primeira": tempos[0],
+            "segundos_mediana": statistics.median(tempos[1:] or tempos),
+            "elementos": len(list(app.main)),
+        }
+        resultados.append(resultado)
+        print(f"  {pagina:<24} primeira: {resultado['segundos_primeira'] * 1e3:8.1f} ms  "
+              f"seguintes: {resultado['segundos_mediana'] * 1e3:8.1f} ms")
+    # Encerra o pool aberto por páginas que submetem simulações em segundo plano.
+    tarefas.gerenciador_padrao().encerrar()
+    return resultados
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecido"
+
+
+def comparar(caminho_antigo, caminho_novo):
+    """Imprime a razão novo/antigo de cada medida presente nos dois arquivos."""
+    with open(caminho_antigo, encoding="utf-8") as f:
+        antigo = json.load(f)
+    with open(caminho_novo, encoding="utf-8") as f:
+        novo = json.load(f)
+
+    def medidas(dados):
+        valores = {}
+        for r in dados.get("nucleos", []):
+            valores[f"{r['nome']} [{r['amostras']:,}]"] = r["segundos_min"]
+        for nome, r in dados.get("inicializacao", {}).items():
+            valores[nome] = r["segundos_mediana"]
+        for r in dados.get("paginas", []):
+            valores[f"página {r['pagina']}"] = r["segundos_mediana"]
+        return valores
+
+    a, b = medidas(antigo), medidas(novo)
+    print(f"{antigo['commit'][:10]} -> {novo['commit'][:10]}")
+    for nome in a.keys() & b.keys():
+        razao = b[nome] / a[nome] if a[nome] else float("inf")
+        print(f"  {nome:<44} {a[nome] * 1e3:10.2f} ms -> {b[nome] * 1e3:10.2f} ms  ({razao:5.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do BESS")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS, help="Nº de amostras das séries")
+    parser.add_argument("--sem-paginas", action="store_true", help="Pula inicialização e páginas")
+    parser.add_argument("--saida", help="Arquivo JSON de saída")
+    parser.add_argument("--comparar", nargs=2, metavar=("ANTIGO", "NOVO"), help="Compara dois resultados")
+    args = parser.parse_args()
+
+    if args.comparar:
+        comparar(*args.comparar)
+        return
+
+    os.chdir(RAIZ)
+    resultado = {
+        "commit": _commit(),
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+    print("Núcleos de simulação:")
+    resultado["nucleos"] = benchmark_nucleos(args.tamanhos)
+    if not args.sem_paginas:
+        print("Inicialização:")
+        resultado["inicializacao"] = benchmark_inicializacao()
+        print("Páginas (AppTest):")
+        resultado["paginas"] = benchmark_paginas()
+
+    saida = args.saida or os.path.join(RAIZ, "benchmarks", "resultados", f"{resultado['commit'][:10]}.json")
+    os.makedirs(os.path.dirname(saida), exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    print(f"Resultados gravados em {saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""
+Núcleo de simulação do BESS, sem interface: importável por jobs em lote, testes e serviços
+sem carregar o Streamlit.
+
+- `simulacao`: Despacho de Peak Shaving e evolução do SoC (arrays NumPy).
+- `tarifas`: Faturamento com as modalidades Verde e Azul.
+- `varredura`, `tecnologias`, `autoconsumo`: Dimensionamento, comparação de tecnologias e autoconsumo FV.
+- `telemetria`, `alarmes`: Agregação da telemetria da frota e alarmes do BMS.
+- `dados`, `cache_resultados`, `tarefas`, `decimacao`: Infraestrutura (séries em disco, cache, processos).
+- `instrumentacao`: Cronômetros e contadores opcionais (`BESS_PERFIL=1`).
+- `cenario`: Estudos de cenários em lote, também pela linha de comando (`python -m bess`).
+- `servico`: Serviço HTTP local com as simulações, com agrupamento de requisições (`python -m bess.servico`).
+"""
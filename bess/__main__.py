@@ -0,0 +1,42 @@
+"""
+Executa um estudo de cenários sem interface:
+
+    python -m bess estudo.json -o series.parquet --resumo resumo.parquet
+
+Não importa o Streamlit; serve para pipelines que rodam milhares de cenários.
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from . import cenario
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bess", description="Executa um estudo de cenários de Peak Shaving.")
+    parser.add_argument("estudo", help="Arquivo do estudo (JSON ou TOML).")
+    parser.add_argument("-o", "--saida", help="Parquet com as séries de todos os cenários (formato longo).")
+    parser.add_argument("--resumo", help="Parquet ou CSV com o resumo por cenário.")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    try:
+        estudo = cenario.carregar(args.estudo)
+    except ValueError as excecao:
+        parser.error(str(excecao))
+    resumo = cenario.executar(estudo, args.saida)
+    decorrido = time.perf_counter() - inicio
+
+    if args.resumo:
+        if args.resumo.endswith(".csv"):
+            resumo.to_csv(args.resumo)
+        else:
+            resumo.to_parquet(args.resumo)
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(resumo.head(20).round(2))
+    print(f"{len(resumo)} cenários x {len(estudo.demanda_mw)} amostras em {decorrido:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Motor de alarmes do BMS em fluxo: limites, taxa de variação e desvio entre células.
+
+Cada amostra de telemetria (um valor por canal, ex.: a tensão de cada célula) é avaliada
+contra regras declarativas, cada uma com histerese para não oscilar em torno do limite:
+- **Limite:** Sobretensão, subtensão, sobretemperatura, sobrecorrente.
+- **Taxa:** Variação por segundo em uma janela (ex.: aquecimento rápido, gatilho da
+  fuga térmica).
+- **Desvio:** Distância da média móvel de cada canal para a média do seu grupo (módulo
+  ou rack), o desbalanceamento que antecede a sobrecarga de uma célula.
+
+As janelas são buffers circulares com somas acumuladas: cada amostra custa O(1) por
+canal, sem recalcular a janela inteira, e todos os canais são avaliados de uma vez.
+A mesma engrenagem reproduz registros históricos muito mais rápido que o tempo real,
+para testar regras novas contra falhas já conhecidas.
+"""
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from . import dados
+
+
+ATIVADO = "ativado"
+NORMALIZADO = "normalizado"
+COLUNAS_EVENTOS = ['Instante', 'Regra', 'Canal', 'Valor', 'Evento']
+
+# As somas acumuladas são refeitas a partir do buffer a cada N voltas, para não acumular erro.
+VOLTAS_POR_RECALCULO = 1000
+
+
+class JanelaMovel:
+    """
+    Janela deslizante das últimas `tamanho` amostras de vários canais, com média e
+    desvio padrão mantidos em O(1) por amostra.
+    """
+    __slots__ = ("buffer", "posicao", "n", "soma", "soma_quadrados", "_voltas")
+
+    def __init__(self, tamanho, n_canais):
+        self.buffer = np.zeros((tamanho, n_canais))
+        self.posicao = 0
+        self.n = 0
+        self.soma = np.zeros(n_canais)
+        self.soma_quadrados = np.zeros(n_canais)
+        self._voltas = 0
+
+    @property
+    def tamanho(self):
+        return len(self.buffer)
+
+    @property
+    def cheia(self):
+        return self.n == self.tamanho
+
+    def adicionar(self, valores):
+        """Acrescenta uma amostra (n_canais,) e descarta a mais antiga se a janela estiver cheia."""
+        if self.cheia:
+            saindo = self.buffer[self.posicao]
+            self.soma -= saindo
+            self.soma_quadrados -= saindo * saindo
+        else:
+            self.n += 1
+        self.buffer[self.posicao] = valores
+        self.soma += valores
+        self.soma_quadrados += valores * valores
+        self.posicao += 1
+        if self.posicao == self.tamanho:
+            self.posicao = 0
+            self._voltas += 1
+            if self._voltas % VOLTAS_POR_RECALCULO == 0:
+                self.soma = self.buffer.sum(axis=0)
+                self.soma_quadrados = (self.buffer * self.buffer).sum(axis=0)
+
+    @property
+    def media(self):
+        return self.soma / max(self.n, 1)
+
+    @property
+    def desvio(self):
+        media = self.media
+        return np.sqrt(np.maximum(self.soma_quadrados / max(self.n, 1) - media * media, 0.0))
+
+    @property
+    def mais_antiga(self):
+        """Amostra mais antiga ainda na janela."""
+        return self.buffer[self.posicao if self.cheia else 0]
+
+
+@dataclass(frozen=True, slots=True)
+class Limite:
+    """Alarme quando o valor sai da faixa [minimo, maximo]."""
+    nome: str
+    grandeza: str
+    maximo: float = math.inf
+    minimo: float = -math.inf
+    histerese: float = 0.0
+
+    def janela_s(self):
+        return 0.0
+
+    def avaliar(self, valores, janela, motor, margem):
+        return (valores > self.maximo - margem) | (valores < self.minimo + margem), valores
+
+
+@dataclass(frozen=True, slots=True)
+class Taxa:
+    """Alarme quando a variação média por segundo, ao longo de `janela`, passa de `maximo_por_s` em módulo."""
+    nome: str
+    grandeza: str
+    maximo_por_s: float
+    janela: float = 10.0
+    histerese: float = 0.0
+
+    def janela_s(self):
+        return self.janela
+
+    def avaliar(self, valores, janela, motor, margem):
+        if janela.n < 2:
+            return np.zeros(len(valores), dtype=bool), np.zeros(len(valores))
+        taxa = (valores - janela.mais_antiga) / ((janela.n - 1) * motor.passo_s)
+        return np.abs(taxa) > self.maximo_por_s - margem, taxa
+
+
+@dataclass(frozen=True, slots=True)
+class Desvio:
+    """Alarme quando a média móvel de um canal se afasta mais que `maximo` da média do seu grupo."""
+    nome: str
+    grandeza: str
+    maximo: float
+    janela: float = 10.0
+    histerese: float = 0.0
+
+    def janela_s(self):
+        return self.janela
+
+    def avaliar(self, valores, janela, motor, margem):
+        media = janela.media
+        desvio = media - motor.media_grupo(media)
+        return np.abs(desvio) > self.maximo - margem, desvio
+
+
+REGRAS_PADRAO = [
+    Limite("Sobretensão", "tensao", maximo=3.65, histerese=0.05),
+    Limite("Subtensão", "tensao", minimo=2.50, histerese=0.10),
+    Limite("Sobretemperatura", "temperatura", maximo=55.0, histerese=5.0),
+    Limite("Subtemperatura na carga", "temperatura", minimo=0.0, histerese=2.0),
+    Taxa("Aquecimento rápido", "temperatura", maximo_por_s=0.5, janela=10.0, histerese=0.3),
+    Desvio("Desbalanceamento de tensão", "tensao", maximo=0.05, janela=30.0, histerese=0.01),
+]
+
+
+class MotorAlarmes:
+    """
+    Avalia as regras amostra a amostra e registra a ativação e a normalização de cada alarme.
+
+    Args:
+    - regras (list): Regras (`Limite`, `Taxa`, `Desvio`).
+    - n_canais (int): Canais por grandeza (ex.: nº de células).
+    - passo_s (float): Intervalo entre amostras (s).
+    - grupos (array | None): Grupo (módulo, rack) de cada canal, usado pelas regras de desvio.
+    - canais (list | None): Nomes dos canais nos eventos; padrão é o índice.
+    """
+
+    def __init__(self, regras, n_canais, passo_s=1.0, grupos=None, canais=None):
+        self.regras = list(regras)
+        self.passo_s = passo_s
+        self.canais = np.asarray(range(n_canais) if canais is None else canais)
+        self.grupos = np.zeros(n_canais, dtype=np.intp) if grupos is None else np.asarray(grupos, dtype=np.intp)
+        self._n_por_grupo = np.bincount(self.grupos)
+        # Uma janela por (grandeza, tamanho): regras com a mesma janela compartilham o buffer,
+        # e cada regra lê só a sua.
+        self._chaves = [(regra.grandeza, int(round(regra.janela_s() / passo_s)) + 1) for regra in self.regras]
+        self._janelas = {chave: JanelaMovel(chave[1], n_canais) for chave in dict.fromkeys(self._chaves)}
+        self._grandezas = list(dict.fromkeys(regra.grandeza for regra in self.regras))
+        self._ativos = np.zeros((len(self.regras), n_canais), dtype=bool)
+        self._eventos = []
+
+    def media_grupo(self, valores):
+        """Média do grupo de cada canal (redução segmentada com `bincount`), devolvida por canal."""
+        return (np.bincount(self.grupos, valores, minlength=len(self._n_por_grupo)) / self._n_por_grupo)[self.grupos]
+
+    @property
+    def ativos(self):
+        """Máscara (regras, canais) dos alarmes ativos neste momento."""
+        return self._ativos.copy()
+
+    def processar(self, amostra, instante):
+        """
+        Avalia uma amostra.
+
+        Args:
+        - amostra (dict[str, array]): Valor de cada canal (n_canais,) por grandeza.
+        - instante: Horário da amostra.
+
+        Returns:
+        - int: Nº de eventos (ativações e normalizações) gerados.
+        """
+        valores = {grandeza: np.asarray(amostra[grandeza], dtype=float) for grandeza in self._grandezas}
+        for (grandeza, _), janela in self._janelas.items():
+            janela.adicionar(valores[grandeza])
+
+        n_antes = len(self._eventos)
+        for i, regra in enumerate(self.regras):
+            # Alarmes ativos só normalizam depois de voltar `histerese` para dentro do limite.
+            margem = np.where(self._ativos[i], regra.histerese, 0.0)
+            condicao, medida = regra.avaliar(valores[regra.grandeza], self._janelas[self._chaves[i]], self, margem)
+            mudou = condicao != self._ativos[i]
+            if mudou.any():
+                for canal in np.flatnonzero(mudou):
+                    evento = ATIVADO if condicao[canal] else NORMALIZADO
+                    self._eventos.append((instante, regra.nome, self.canais[canal], float(medida[canal]), evento))
+                self._ativos[i] = condicao
+        return len(self._eventos) - n_antes
+
+    def eventos(self):
+        """Eventos registrados até agora, na ordem em que ocorreram (DataFrame com `COLUNAS_EVENTOS`)."""
+        return pd.DataFrame(self._eventos, columns=COLUNAS_EVENTOS)
+
+
+def reproduzir(series, regras=REGRAS_PADRAO, instantes=None, passo_s=1.0, grupos=None, canais=None):
+    """
+    Reproduz um registro histórico pelo motor de alarmes, o mais rápido possível.
+
+    Args:
+    - series (dict[str, array]): Um array (T, n_canais) por grandeza.
+    - regras (list): Regras avaliadas.
+    - instantes (array | None): Horário de cada amostra; padrão é o nº da amostra x `passo_s`.
+    - passo_s (float): Intervalo entre amostras no registro (s).
+    - grupos, canais: Ver `MotorAlarmes`.
+
+    Returns:
+    - tuple[pandas.DataFrame, float]: Eventos e a velocidade da reprodução em relação ao
+      tempo real (ex.: 5000 = 5000x mais rápido).
+    """
+    series = {grandeza: np.asarray(valores, dtype=float) for grandeza, valores in series.items()}
+    n_amostras, n_canais = next(iter(series.values())).shape
+    if instantes is None:
+        instantes = np.arange(n_amostras) * passo_s
+    motor = MotorAlarmes(regras, n_canais, passo_s, grupos, canais)
+
+    inicio = time.perf_counter()
+    for t in range(n_amostras):
+        motor.processar({grandeza: valores[t] for grandeza, valores in series.items()}, instantes[t])
+    decorrido = time.perf_counter() - inicio
+    return motor.eventos(), n_amostras * passo_s / max(decorrido, 1e-9)
+
+
+def reproduzir_arquivos(caminhos, regras=REGRAS_PADRAO, inicio=None, fim=None, grupos=None):
+    """
+    Reproduz registros gravados pela camada de dados (`dados.py`).
+
+    Args:
+    - caminhos (dict[str, str]): Arquivo Parquet/Arrow de cada grandeza, em formato largo
+      (coluna de tempo + uma coluna por canal, com os mesmos nomes em todos os arquivos).
+    - regras (list): Regras avaliadas.
+    - inicio, fim: Trecho do registro a reproduzir.
+    - grupos (array | None): Grupo de cada canal, na ordem das colunas.
+
+    Returns:
+    - tuple[pandas.DataFrame, float]: Ver `reproduzir`.
+    """
+    tabelas = {grandeza: dados.ler_serie(caminho, inicio=inicio, fim=fim) for grandeza, caminho in caminhos.items()}
+    primeira = next(iter(tabelas.values()))
+    canais = [nome for nome in primeira.schema.names if nome != dados.COLUNA_TEMPO]
+    instantes = primeira.column(dados.COLUNA_TEMPO).to_pandas()
+    passo_s = instantes.diff().median().total_seconds() if len(instantes) > 1 else 1.0
+    series = {
+        grandeza: np.column_stack([tabela.column(canal).to_numpy() for canal in canais])
+        for grandeza, tabela in tabelas.items()
+    }
+    return reproduzir(series, regras, instantes.to_numpy(), passo_s, grupos, canais)
@@ -0,0 +1,212 @@
+"""
+Simulação de autoconsumo atrás do medidor: carga + geração fotovoltaica + BESS.
+
+O BESS guarda o excedente solar para usá-lo quando a geração não atende a carga,
+respeitando:
+- **Limite de exportação:** O excedente que não cabe na bateria só pode ser injetado na
+  rede até esse limite; o restante é cortado (curtailment).
+- **Reserva de backup:** Uma fração do SoC fica reservada para emergências e não é usada
+  no autoconsumo.
+
+O núcleo é um laço em fluxo (streaming): recebe as séries em blocos e carrega o estado
+da bateria de um bloco para o outro, então anos de dados em 15 min nunca precisam estar
+inteiros na memória. Em cada passo, todos os consumidores de um lote são calculados de
+uma vez; carteiras com milhares de perfis são divididas em lotes entre processos.
+"""
+import math
+from dataclasses import dataclass, fields, replace
+from itertools import zip_longest
+
+import numpy as np
+import pandas as pd
+
+from . import dados, tarefas
+
+
+LINHAS_POR_BLOCO = 96 * 30  # Um mês em 15 min
+CONSUMIDORES_POR_LOTE = 256
+
+FLUXOS = ('Importação (kW)', 'Exportação (kW)', 'Corte (kW)', 'BESS (kW)', 'SoC')
+COLUNAS_RESUMO = [
+    'Consumo (kWh)', 'Geração FV (kWh)', 'Importação (kWh)', 'Exportação (kWh)', 'Corte (kWh)',
+    'Autoconsumo FV (%)', 'Autossuficiência (%)',
+]
+
+
+@dataclass(frozen=True, slots=True)
+class ParametrosAutoconsumo:
+    """
+    Parâmetros do BESS residencial/comercial (kW, kWh). Podem ser escalares ou arrays
+    com um valor por consumidor.
+    """
+    potencia_kw: float
+    energia_kwh: float
+    eficiencia: float = 0.9
+    soc_reserva: float = 0.2
+    soc_inicial: float = 0.5
+    limite_exportacao_kw: float = math.inf
+
+
+def simular_fluxo(blocos, parametros, passo_h=0.25):
+    """
+    Núcleo em fluxo: percorre blocos (carga, pv) e devolve os fluxos de cada bloco.
+
+    Args:
+    - blocos (iterável): Pares (carga_kw, pv_kw) de arrays com forma (T_bloco, C)
+      ou (T_bloco,) para um único consumidor.
+    - parametros (ParametrosAutoconsumo): Parâmetros do BESS.
+    - passo_h (float): Duração de cada amostra em horas.
+
+    Yields:
+    - dict[str, numpy.ndarray]: Um array (T_bloco, C) por fluxo de `FLUXOS`
+      ('BESS (kW)' é positivo descarregando).
+    """
+    energia = None
+    for carga, pv in blocos:
+        carga = np.asarray(carga, dtype=float).reshape(len(carga), -1)
+        pv = np.asarray(pv, dtype=float).reshape(len(pv), -1)
+        if energia is None:
+            n = carga.shape[1]
+            potencia = np.broadcast_to(np.asarray(parametros.potencia_kw, dtype=float), n)
+            energia_max = np.broadcast_to(np.asarray(parametros.energia_kwh, dtype=float), n)
+            limite_exportacao = np.broadcast_to(np.asarray(parametros.limite_exportacao_kw, dtype=float), n)
+            # Metade das perdas na carga, metade na descarga.
+            eta = np.sqrt(np.broadcast_to(np.asarray(parametros.eficiencia, dtype=float), n))
+            reserva = np.asarray(parametros.soc_reserva, dtype=float) * energia_max
+            capacidade = np.where(energia_max > 0, energia_max, 1.0)
+            energia = np.asarray(parametros.soc_inicial, dtype=float) * energia_max
+
+        saidas = {nome: np.empty_like(carga) for nome in FLUXOS}
+        liquido = carga - pv
+        for t in range(len(liquido)):
+            excedente = np.maximum(-liquido[t], 0.0)
+            deficit = np.maximum(liquido[t], 0.0)
+
+            recarga = np.minimum(np.minimum(excedente, potencia), (energia_max - energia) / (eta * passo_h))
+            sobra = excedente - recarga
+            exportacao = np.minimum(sobra, limite_exportacao)
+
+            descarga = np.minimum(np.minimum(deficit, potencia), np.maximum(energia - reserva, 0.0) * eta / passo_h)
+            energia = energia + recarga * eta * passo_h - descarga * passo_h / eta
+
+            saidas['Importação (kW)'][t] = deficit - descarga
+            saidas['Exportação (kW)'][t] = exportacao
+            saidas['Corte (kW)'][t] = sobra - exportacao
+            saidas['BESS (kW)'][t] = descarga - recarga
+            saidas['SoC'][t] = energia / capacidade
+        yield saidas
+
+
+def _resumo_vazio(n):
+    return {coluna: np.zeros(n) for coluna in COLUNAS_RESUMO[:5]}
+
+
+def _acumular(resumo, carga, pv, saidas, passo_h):
+    resumo['Consumo (kWh)'] += carga.reshape(len(carga), -1).sum(axis=0) * passo_h
+    resumo['Geração FV (kWh)'] += pv.reshape(len(pv), -1).sum(axis=0) * passo_h
+    resumo['Importação (kWh)'] += saidas['Importação (kW)'].sum(axis=0) * passo_h
+    resumo['Exportação (kWh)'] += saidas['Exportação (kW)'].sum(axis=0) * passo_h
+    resumo['Corte (kWh)'] += saidas['Corte (kW)'].sum(axis=0) * passo_h
+
+
+def _finalizar(resumo, consumidores):
+    tabela = pd.DataFrame(resumo, index=pd.Index(consumidores, name='Consumidor'))
+    gerado = tabela['Geração FV (kWh)']
+    aproveitado = gerado - tabela['Exportação (kWh)'] - tabela['Corte (kWh)']
+    tabela['Autoconsumo FV (%)'] = 100 * aproveitado / gerado.where(gerado > 0)
+    tabela['Autossuficiência (%)'] = 100 * (1 - tabela['Importação (kWh)'] / tabela['Consumo (kWh)'].where(tabela['Consumo (kWh)'] > 0))
+    return tabela
+
+
+def simular_autoconsumo(carga_kw, pv_kw, parametros, passo_h=0.25, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """
+    Simula séries em memória (um ou mais consumidores) e devolve fluxos e resumo.
+
+    Args:
+    - carga_kw, pv_kw (array): Forma (T,) ou (T, C).
+    - parametros (ParametrosAutoconsumo): Parâmetros do BESS.
+    - passo_h (float): Duração de cada amostra em horas.
+
+    Returns:
+    - tuple[dict, pandas.DataFrame]: Fluxos (arrays (T, C)) e o resumo por consumidor.
+    """
+    carga_kw = np.asarray(carga_kw, dtype=float)
+    pv_kw = np.asarray(pv_kw, dtype=float)
+    n = 1 if carga_kw.ndim == 1 else carga_kw.shape[1]
+    fatias = [slice(i, i + linhas_por_bloco) for i in range(0, len(carga_kw), linhas_por_bloco)]
+    resumo = _resumo_vazio(n)
+    partes = {nome: [] for nome in FLUXOS}
+    for fatia, saidas in zip(fatias, simular_fluxo(((carga_kw[f], pv_kw[f]) for f in fatias), parametros, passo_h)):
+        _acumular(resumo, carga_kw[fatia], pv_kw[fatia], saidas, passo_h)
+        for nome in FLUXOS:
+            partes[nome].append(saidas[nome])
+    fluxos = {nome: np.concatenate(v) if v else np.empty((0, n)) for nome, v in partes.items()}
+    return fluxos, _finalizar(resumo, list(range(n)))
+
+
+def _simular_lote(caminho_carga, caminho_pv, consumidores, parametros, passo_h, linhas_por_bloco):
+    # Cada processo lê só as colunas do seu lote (projeção) e percorre os arquivos em blocos,
+    # sem carregar a série inteira; carga e PV avançam juntos, bloco a bloco.
+    blocos_carga = dados.ler_blocos(caminho_carga, consumidores, linhas_por_bloco)
+    blocos_pv = dados.ler_blocos(caminho_pv, consumidores, linhas_por_bloco)
+
+    atual = {}
+
+    def blocos():
+        # O bloco atual fica guardado para o resumo, sem ler o arquivo duas vezes.
+        for carga, pv in zip_longest(blocos_carga, blocos_pv):
+            if carga is None or pv is None or not carga.column(dados.COLUNA_TEMPO).equals(pv.column(dados.COLUNA_TEMPO)):
+                raise ValueError("Os arquivos de carga e de PV devem ter os mesmos instantes")
+            atual['carga'] = np.column_stack([carga.column(c).to_numpy() for c in consumidores])
+            atual['pv'] = np.column_stack([pv.column(c).to_numpy() for c in consumidores])
+            yield atual['carga'], atual['pv']
+
+    resumo = _resumo_vazio(len(consumidores))
+    for saidas in simular_fluxo(blocos(), parametros, passo_h):
+        _acumular(resumo, atual['carga'], atual['pv'], saidas, passo_h)
+    return _finalizar(resumo, consumidores)
+
+
+def _fatiar(parametros, inicio, n):
+    # Parâmetros por consumidor (arrays) são cortados no trecho do lote; escalares seguem iguais.
+    trechos = {}
+    for campo in fields(parametros):
+        valor = np.asarray(getattr(parametros, campo.name))
+        if valor.ndim:
+            trechos[campo.name] = valor[inicio:inicio + n]
+    return replace(parametros, **trechos)
+
+
+def simular_carteira(caminho_carga, caminho_pv, parametros, consumidores=None, passo_h=0.25,
+                     consumidores_por_lote=CONSUMIDORES_POR_LOTE, linhas_por_bloco=LINHAS_POR_BLOCO, max_processos=None):
+    """
+    Resumo de autoconsumo de uma carteira de consumidores, em paralelo.
+
+    As séries vêm de arquivos da camada de dados (`dados.py`), em formato largo: coluna de
+    tempo + uma coluna por consumidor, com os mesmos nomes nos arquivos de carga e de PV.
+
+    Args:
+    - caminho_carga, caminho_pv (str): Arquivos Parquet/Arrow com carga e geração (kW).
+    - parametros (ParametrosAutoconsumo): Parâmetros do BESS; os campos que forem arrays
+      têm um valor por consumidor, na ordem de `consumidores`.
+    - consumidores (list[str] | None): Colunas a simular; padrão é todas.
+    - passo_h (float): Duração de cada amostra em horas.
+    - consumidores_por_lote (int): Consumidores calculados juntos em cada tarefa.
+    - linhas_por_bloco (int): Amostras processadas por vez dentro de cada tarefa.
+    - max_processos (int | None): Nº de processos; padrão é o nº de CPUs.
+
+    Returns:
+    - pandas.DataFrame: Uma linha por consumidor com as colunas de `COLUNAS_RESUMO`.
+    """
+    if consumidores is None:
+        fonte = dados.abrir(caminho_carga)
+        consumidores = [nome for nome in fonte.schema.names if nome != dados.COLUNA_TEMPO]
+    inicios = range(0, len(consumidores), consumidores_por_lote)
+    lotes = [consumidores[i:i + consumidores_por_lote] for i in inicios]
+
+    argumentos = [
+        (caminho_carga, caminho_pv, lote, _fatiar(parametros, inicio, len(lote)), passo_h, linhas_por_bloco)
+        for inicio, lote in zip(inicios, lotes)
+    ]
+    resultados = tarefas.mapear_lotes(_simular_lote, argumentos, max_processos)
+    return pd.concat(resultados).reindex(consumidores)
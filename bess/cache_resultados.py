@@ -0,0 +1,213 @@
+"""
+Cache de resultados de simulação compartilhado entre todas as sessões do servidor.
+
+Os resultados são identificados por um hash das entradas e da versão do modelo e
+ficam em dois níveis:
+
+1.  **Memória (LRU):** Dicionário do processo, consultado primeiro. Todas as sessões
+    do Streamlit rodam no mesmo processo e, portanto, compartilham esse nível.
+2.  **Disco (SQLite):** Sobrevive a reinícios do servidor e é compartilhado entre
+    processos. Tem limite de tamanho; os resultados acessados há mais tempo saem primeiro.
+
+Assim, um cenário popular é calculado uma vez por implantação, e não uma vez por visitante.
+"""
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from . import instrumentacao
+
+
+DIRETORIO_PADRAO = os.environ.get("BESS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "bess-info"))
+MAX_ITENS_MEMORIA = 256
+MAX_BYTES_DISCO = 512 * 1024 * 1024
+
+
+def _atualizar_hash(h, valor):
+    # Codificação canônica das entradas: o mesmo cenário sempre gera a mesma chave.
+    if isinstance(valor, np.ndarray):
+        h.update(b"nd" + str(valor.dtype).encode() + str(valor.shape).encode())
+        h.update(np.ascontiguousarray(valor).view(np.uint8) if valor.dtype != object else repr(valor.tolist()).encode())
+    elif isinstance(valor, (pd.Series, pd.Index)):
+        h.update(b"pd")
+        _atualizar_hash(h, valor.to_numpy())
+    elif isinstance(valor, pd.DataFrame):
+        h.update(b"df" + repr(list(valor.columns)).encode())
+        for coluna in valor.columns:
+            _atualizar_hash(h, valor[coluna].to_numpy())
+    elif isinstance(valor, dict):
+        h.update(b"{")
+        for k in sorted(valor, key=repr):
+            _atualizar_hash(h, k)
+            _atualizar_hash(h, valor[k])
+        h.update(b"}")
+    elif isinstance(valor, (list, tuple)):
+        h.update(b"(" if isinstance(valor, tuple) else b"[")
+        for item in valor:
+            _atualizar_hash(h, item)
+        h.update(b")")
+    else:
+        h.update(type(valor).__name__.encode() + repr(valor).encode())
+
+
+def chave(nome, versao, *args, **kwargs):
+    """
+    Hash das entradas de uma simulação.
+
+    Args:
+    - nome (str): Identificador da simulação (ex.: nome qualificado da função).
+    - versao (str): Versão do modelo; mudar a versão invalida os resultados antigos.
+    - *args, **kwargs: Entradas da simulação (números, listas, dicts, arrays, DataFrames).
+
+    Returns:
+    - str: Chave hexadecimal (SHA-256).
+    """
+    h = hashlib.sha256()
+    _atualizar_hash(h, (nome, str(versao), args, kwargs))
+    return h.hexdigest()
+
+
+class ArmazemResultados:
+    """
+    Armazém de resultados em dois níveis (LRU em memória + SQLite em disco).
+
+    Os resultados devolvidos são compartilhados entre sessões e não devem ser modificados.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_PADRAO, max_itens_memoria=MAX_ITENS_MEMORIA, max_bytes_disco=MAX_BYTES_DISCO):
+        self.max_itens_memoria = max_itens_memoria
+        self.max_bytes_disco = max_bytes_disco
+        self._memoria = OrderedDict()
+        self._trava = threading.Lock()
+        self._local = threading.local()
+        self.caminho = None
+        if diretorio is not None and max_bytes_disco > 0:
+            os.makedirs(diretorio, exist_ok=True)
+            self.caminho = os.path.join(diretorio, "resultados.sqlite")
+            with self._conexao() as con:
+                con.execute("""
+                    CREATE TABLE IF NOT EXISTS resultados (
+                        chave TEXT PRIMARY KEY,
+                        valor BLOB NOT NULL,
+                        tamanho INTEGER NOT NULL,
+                        acesso REAL NOT NULL
+                    )""")
+                con.execute("CREATE INDEX IF NOT EXISTS idx_acesso ON resultados (acesso)")
+
+    def _conexao(self):
+        # Uma conexão por thread (cada sessão do Streamlit roda em sua própria thread).
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.caminho, timeout=30)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            self._local.con = con
+        return con
+
+    def _guardar_memoria(self, chave, valor):
+        with self._trava:
+            self._memoria[chave] = valor
+            self._memoria.move_to_end(chave)
+            while len(self._memoria) > self.max_itens_memoria:
+                self._memoria.popitem(last=False)
+
+    def obter(self, chave, padrao=None):
+        with self._trava:
+            if chave in self._memoria:
+                self._memoria.move_to_end(chave)
+                return self._memoria[chave]
+        if self.caminho is None:
+            return padrao
+        with self._conexao() as con:
+            linha = con.execute("SELECT valor FROM resultados WHERE chave = ?", (chave,)).fetchone()
+            if linha is None:
+                return padrao
+            con.execute("UPDATE resultados SET acesso = ? WHERE chave = ?", (time.time(), chave))
+        valor = pickle.loads(linha[0])
+        self._guardar_memoria(chave, valor)
+        return valor
+
+    def guardar(self, chave, valor):
+        self._guardar_memoria(chave, valor)
+        if self.caminho is None:
+            return
+        blob = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes_disco:
+            return
+        with self._conexao() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO resultados (chave, valor, tamanho, acesso) VALUES (?, ?, ?, ?)",
+                (chave, blob, len(blob), time.time()),
+            )
+            self._despejar(con)
+
+    def _despejar(self, con):
+        # Remove os resultados acessados há mais tempo até caber no limite do disco.
+        total = con.execute("SELECT COALESCE(SUM(tamanho), 0) FROM resultados").fetchone()[0]
+        if total <= self.max_bytes_disco:
+            return
+        excesso = total - self.max_bytes_disco
+        removidas = []
+        for chave_antiga, tamanho in con.execute("SELECT chave, tamanho FROM resultados ORDER BY acesso"):
+            removidas.append((chave_antiga,))
+            excesso -= tamanho
+            if excesso <= 0:
+                break
+        con.executemany("DELETE FROM resultados WHERE chave = ?", removidas)
+
+    def limpar(self):
+        with self._trava:
+            self._memoria.clear()
+        if self.caminho is not None:
+            with self._conexao() as con:
+                con.execute("DELETE FROM resultados")
+
+
+_armazem = None
+_trava_armazem = threading.Lock()
+
+
+def armazem_padrao():
+    """Armazém único do processo, criado na primeira chamada."""
+    global _armazem
+    with _trava_armazem:
+        if _armazem is None:
+            _armazem = ArmazemResultados()
+        return _armazem
+
+
+def resultado_cacheado(versao):
+    """
+    Decorador que guarda o resultado da função no armazém compartilhado.
+
+    Args:
+    - versao (str): Versão do modelo. Incremente sempre que a lógica da simulação mudar.
+    """
+    def decorador(funcao):
+        nome = f"{funcao.__module__}.{funcao.__qualname__}"
+        ausente = object()
+
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            armazem = armazem_padrao()
+            k = chave(nome, versao, *args, **kwargs)
+            resultado = armazem.obter(k, ausente)
+            if resultado is ausente:
+                instrumentacao.contar("resultado_cacheado: faltas")
+                resultado = funcao(*args, **kwargs)
+                armazem.guardar(k, resultado)
+            else:
+                instrumentacao.contar("resultado_cacheado: acertos")
+            return resultado
+
+        envoltorio.sem_cache = funcao
+        return envoltorio
+    return decorador
@@ -0,0 +1,224 @@
+"""
+Estudos de cenários de Peak Shaving em lote, sem interface (usado por `python -m bess`).
+
+Um estudo é um arquivo JSON ou TOML com um perfil de demanda e uma lista de cenários
+(configurações do BESS). Os cenários são despachados em lotes com `simulacao.despachar`,
+que calcula todo o lote de uma vez ao longo do eixo de parâmetros, e as séries de cada
+lote são gravadas em Parquet à medida que ficam prontas, então milhares de cenários
+cabem em memória constante. Exemplo:
+
+    {
+      "demanda": "carga.parquet", "coluna": "demanda_mw",
+      "tarifa": "verde",
+      "cenarios": [
+        {"nome": "50MW-200MWh", "potencia_mw": 50, "energia_mwh": 200, "limiar_mw": 180},
+        {"nome": "100MW-400MWh", "potencia_mw": 100, "energia_mwh": 400, "limiar_mw": 160}
+      ]
+    }
+
+`demanda` também pode ser uma lista de valores (MW), com `inicio` e `passo_h` para o
+eixo de tempo. `tarifa` é "verde", "azul" ou um objeto com os campos de `tarifas.Tarifa`.
+"""
+import json
+import os
+import tomllib
+from dataclasses import MISSING, dataclass, fields
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from . import dados, simulacao, tarifas
+
+
+MEMORIA_MAX_BYTES = 256 * 1024 * 1024
+# Arrays (P, T) de float64 por lote: os de `despachar`, as cópias da tabela de saída (rede, BESS e
+# SoC achatados, demanda e instantes repetidos, índice do cenário), o `np.clip` do resumo e, com
+# tarifa, a rede em kW para o faturamento.
+ARRAYS_POR_CENARIO = simulacao.ARRAYS_DESPACHAR + 8
+
+COLUNA_CENARIO = 'Cenário'
+COLUNAS_SERIES = ['Demanda Total (MW)', 'Potência da Rede (MW)', 'Potência do BESS (MW)', 'SoC']
+COLUNAS_RESUMO = ['Pico da Rede (MW)', 'Redução de Pico (MW)', 'Energia Descarregada (MWh)', 'SoC Mínimo']
+
+
+@dataclass(frozen=True, slots=True)
+class Cenario:
+    """Configuração do BESS em um cenário (MW, MWh)."""
+    nome: str
+    potencia_mw: float
+    energia_mwh: float
+    eficiencia: float = 0.9
+    limiar_mw: float = 0.0
+    soc_inicial: float = 1.0
+
+
+@dataclass(frozen=True, eq=False, slots=True)
+class Estudo:
+    """Perfil de demanda, eixo de tempo, cenários e, opcionalmente, a tarifa para o faturamento."""
+    demanda_mw: np.ndarray
+    instantes: pd.DatetimeIndex
+    passo_h: float
+    cenarios: tuple
+    tarifa: tarifas.Tarifa | None = None
+
+
+def _ler(caminho):
+    with open(caminho, "rb") as arquivo:
+        if caminho.endswith(".toml"):
+            return tomllib.load(arquivo)
+        return json.load(arquivo)
+
+
+def _tarifa(valor):
+    if valor is None:
+        return None
+    if isinstance(valor, str):
+        if valor not in tarifas.TARIFAS_EXEMPLO:
+            raise ValueError(f"Tarifa desconhecida: {valor!r} (use {' ou '.join(map(repr, tarifas.TARIFAS_EXEMPLO))})")
+        return tarifas.TARIFAS_EXEMPLO[valor]
+    campos = {campo.name for campo in fields(tarifas.Tarifa)}
+    desconhecidos = set(valor) - campos
+    if desconhecidos:
+        raise ValueError(f"Tarifa: campos desconhecidos {sorted(desconhecidos)}")
+    ausentes = _obrigatorios(tarifas.Tarifa) - set(valor)
+    if ausentes:
+        raise ValueError(f"Tarifa: campos obrigatórios ausentes {sorted(ausentes)}")
+    return tarifas.Tarifa(**valor)
+
+
+def _obrigatorios(classe):
+    return {campo.name for campo in fields(classe) if campo.default is MISSING}
+
+
+def carregar(caminho: str) -> Estudo:
+    """
+    Lê um estudo de um arquivo JSON ou TOML.
+
+    Caminhos relativos (arquivo de demanda) são resolvidos a partir da pasta do estudo.
+
+    Returns:
+    - Estudo: O estudo, pronto para `executar`.
+    """
+    bruto = _ler(caminho)
+    if "demanda" not in bruto:
+        raise ValueError(f"{caminho}: o estudo precisa de 'demanda' (lista de valores ou arquivo)")
+    demanda = bruto["demanda"]
+    if isinstance(demanda, str):
+        if "coluna" not in bruto:
+            raise ValueError(f"{caminho}: com 'demanda' em arquivo, informe a 'coluna' com a demanda (MW)")
+        arquivo = os.path.join(os.path.dirname(os.path.abspath(caminho)), demanda)
+        tabela = dados.ler_serie(arquivo, [bruto["coluna"]], bruto.get("inicio"), bruto.get("fim"))
+        instantes = pd.DatetimeIndex(tabela.column(dados.COLUNA_TEMPO).to_pandas())
+        demanda = tabela.column(bruto["coluna"]).to_numpy()
+        passo_h = instantes.to_series().diff().median() / pd.Timedelta(hours=1) if len(instantes) > 1 else 1.0
+    else:
+        passo_h = float(bruto.get("passo_h", 1.0))
+        instantes = pd.date_range(bruto.get("inicio", "2025-01-01"), periods=len(demanda), freq=pd.Timedelta(hours=passo_h))
+
+    if not bruto.get("cenarios"):
+        raise ValueError(f"{caminho}: o estudo precisa de ao menos um cenário em 'cenarios'")
+    campos = {campo.name for campo in fields(Cenario)}
+    obrigatorios = _obrigatorios(Cenario) - {"nome"}
+    cenarios = []
+    for i, cenario in enumerate(bruto["cenarios"]):
+        desconhecidos = set(cenario) - campos
+        if desconhecidos:
+            raise ValueError(f"Cenário {i}: campos desconhecidos {sorted(desconhecidos)}")
+        ausentes = obrigatorios - set(cenario)
+        if ausentes:
+            raise ValueError(f"Cenário {i}: campos obrigatórios ausentes {sorted(ausentes)}")
+        cenarios.append(Cenario(**{"nome": f"cenario_{i}", **cenario}))
+    nomes = [c.nome for c in cenarios]
+    repetidos = sorted({nome for nome in nomes if nomes.count(nome) > 1})
+    if repetidos:
+        raise ValueError(f"{caminho}: nomes de cenário repetidos {repetidos}")
+
+    return Estudo(
+        demanda_mw=np.asarray(demanda, dtype=float),
+        instantes=instantes,
+        passo_h=float(passo_h),
+        cenarios=tuple(cenarios),
+        tarifa=_tarifa(bruto.get("tarifa")),
+    )
+
+
+def _lotes(estudo, memoria_max_bytes):
+    # Quantos cenários cabem juntos no orçamento de memória.
+    n_amostras = len(estudo.demanda_mw)
+    tamanho = max(1, int(memoria_max_bytes // (n_amostras * 8 * ARRAYS_POR_CENARIO)))
+    for inicio in range(0, len(estudo.cenarios), tamanho):
+        yield estudo.cenarios[inicio:inicio + tamanho]
+
+
+def _executar_lote(estudo, lote):
+    parametros = {campo: np.array([getattr(c, campo) for c in lote], dtype=float)
+                  for campo in ('potencia_mw', 'energia_mwh', 'eficiencia', 'limiar_mw', 'soc_inicial')}
+    rede, bess, soc = simulacao.despachar(
+        estudo.demanda_mw, parametros['potencia_mw'], parametros['energia_mwh'], parametros['eficiencia'],
+        parametros['limiar_mw'], soc_inicial=parametros['soc_inicial'], passo_h=estudo.passo_h,
+    )
+    nomes = [c.nome for c in lote]
+    n, t = rede.shape
+
+    # Formato longo: um bloco de T linhas por cenário; o nome do cenário é codificado como dicionário.
+    series = pa.table({
+        COLUNA_CENARIO: pa.DictionaryArray.from_arrays(np.repeat(np.arange(n, dtype=np.int32), t), nomes),
+        dados.COLUNA_TEMPO: pa.array(np.tile(estudo.instantes.to_numpy(), n)),
+        COLUNAS_SERIES[0]: np.tile(estudo.demanda_mw, n),
+        COLUNAS_SERIES[1]: rede.ravel(),
+        COLUNAS_SERIES[2]: bess.ravel(),
+        COLUNAS_SERIES[3]: soc.ravel(),
+    })
+
+    resumo = pd.DataFrame({
+        COLUNAS_RESUMO[0]: rede.max(axis=1),
+        COLUNAS_RESUMO[1]: estudo.demanda_mw.max() - rede.max(axis=1),
+        COLUNAS_RESUMO[2]: np.clip(bess, 0.0, None).sum(axis=1) * estudo.passo_h,
+        COLUNAS_RESUMO[3]: soc.min(axis=1),
+    }, index=pd.Index(nomes, name=COLUNA_CENARIO))
+
+    if estudo.tarifa is not None:
+        # Uma única fatura para todos os cenários do lote (uma coluna por cenário, em kW). As
+        # colunas são as posições no lote, e não os nomes, para que nomes repetidos não se somem.
+        depois = pd.DataFrame(rede.T * 1000, index=estudo.instantes)
+        antes = pd.Series(estudo.demanda_mw * 1000, index=estudo.instantes, name="sem_bess")
+        sem_bess = tarifas.faturar(antes, estudo.tarifa)['Total (R$)'].sum()
+        com_bess = tarifas.faturar(depois, estudo.tarifa)['Total (R$)'].groupby(level='Consumidor').sum()
+        resumo['Fatura sem BESS (R$)'] = sem_bess
+        resumo['Fatura com BESS (R$)'] = com_bess.reindex(range(n)).to_numpy()
+        resumo['Economia (R$)'] = sem_bess - resumo['Fatura com BESS (R$)']
+    return series, resumo
+
+
+def executar(estudo: Estudo, saida: str | None = None, memoria_max_bytes: int = MEMORIA_MAX_BYTES) -> pd.DataFrame:
+    """
+    Despacha todos os cenários do estudo.
+
+    Args:
+    - estudo (Estudo): Estudo carregado com `carregar` (ou montado em código).
+    - saida (str | None): Arquivo Parquet para as séries, gravado lote a lote. Sem `saida`,
+      as séries não são guardadas (só o resumo é devolvido).
+    - memoria_max_bytes (int): Orçamento de memória de cada lote de cenários.
+
+    Returns:
+    - pandas.DataFrame: Uma linha por cenário com as colunas de `COLUNAS_RESUMO` e, se o
+      estudo tiver tarifa, a fatura sem e com o BESS e a economia no período.
+    """
+    if not estudo.cenarios:
+        raise ValueError("O estudo não tem cenários")
+    escritor = None
+    resumos = []
+    try:
+        for lote in _lotes(estudo, memoria_max_bytes):
+            series, resumo = _executar_lote(estudo, lote)
+            resumos.append(resumo)
+            if saida is not None:
+                if escritor is None:
+                    escritor = pq.ParquetWriter(saida, series.schema)
+                escritor.write_table(series)
+    finally:
+        if escritor is not None:
+            escritor.close()
+    return pd.concat(resumos)
@@ -0,0 +1,186 @@
+"""
+Camada de dados para séries temporais do BESS (carga, PV, preço, telemetria).
+
+As séries são lidas de arquivos colunares (Parquet ou Arrow IPC/Feather) usando
+memory-map, projeção de colunas e filtro por intervalo de tempo. Assim, uma página
+só lê do disco a fatia que vai plotar, mesmo em arquivos de vários GB.
+
+As tabelas abertas ficam em um cache do processo: todas as sessões do Streamlit
+compartilham o mesmo mapeamento do arquivo em vez de cada uma ter sua cópia em RAM.
+"""
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+
+COLUNA_TEMPO = "timestamp"
+EXTENSOES_IPC = (".arrow", ".feather", ".ipc")
+EXTENSOES_PARQUET = (".parquet", ".pq")
+
+# Linhas por row group ao escrever Parquet: grupos menores deixam o filtro por
+# tempo descartar mais dados usando apenas as estatísticas (min/max) do arquivo.
+LINHAS_POR_GRUPO = 64 * 1024
+
+
+def _formato(caminho):
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao in EXTENSOES_IPC:
+        return "ipc"
+    if extensao in EXTENSOES_PARQUET or os.path.isdir(caminho):
+        return "parquet"
+    raise ValueError(f"Formato de arquivo não suportado: {caminho!r} (use Parquet ou Arrow IPC)")
+
+
+@lru_cache(maxsize=32)
+def _abrir(caminho, mtime):
+    # O mtime faz parte da chave: se o arquivo for regravado, ele é reaberto.
+    if _formato(caminho) == "ipc":
+        # Arquivo IPC sem compressão é lido sem cópia: os buffers apontam para o mmap.
+        return ipc.open_file(pa.memory_map(caminho, "r")).read_all()
+    return ds.dataset(caminho, format="parquet", filesystem=pafs.LocalFileSystem(use_mmap=True))
+
+
+def abrir(caminho):
+    """
+    Abre (ou reaproveita do cache do processo) a fonte de dados de um arquivo.
+
+    Returns:
+    - pyarrow.Table (Arrow IPC, mapeado em memória) ou pyarrow.dataset.Dataset (Parquet).
+    """
+    caminho = os.path.abspath(caminho)
+    return _abrir(caminho, os.path.getmtime(caminho))
+
+
+def _como_escalar(valor, tipo):
+    # Converte str/datetime/pd.Timestamp para um escalar Arrow do mesmo tipo da coluna.
+    # Limites sem fuso, em colunas com fuso, são horários locais desse fuso (e não UTC).
+    instante = pd.Timestamp(valor)
+    if instante.tzinfo is None and getattr(tipo, "tz", None):
+        instante = instante.tz_localize(tipo.tz)
+    if instante.tzinfo is not None:
+        instante = instante.tz_convert("UTC").tz_localize(None)
+    return pa.scalar(instante.value, type=pa.timestamp("ns")).cast(tipo, safe=False)
+
+
+def _filtro_tempo(campo, tipo, inicio, fim):
+    filtro = None
+    if inicio is not None:
+        filtro = campo >= _como_escalar(inicio, tipo)
+    if fim is not None:
+        condicao = campo < _como_escalar(fim, tipo)
+        filtro = condicao if filtro is None else filtro & condicao
+    return filtro
+
+
+def _fatiar_ordenada(tabela, coluna_tempo, inicio, fim):
+    # As séries são gravadas ordenadas pelo tempo, então o intervalo vira um
+    # par de buscas binárias e um slice sem cópia da tabela.
+    tempo = tabela.column(coluna_tempo)
+    if tempo.num_chunks != 1 or tempo.null_count:
+        filtro = _filtro_tempo(pc.field(coluna_tempo), tempo.type, inicio, fim)
+        return tabela.filter(filtro)
+    instantes = tempo.chunk(0).cast(pa.int64()).to_numpy()
+    i0 = 0 if inicio is None else int(np.searchsorted(instantes, _como_escalar(inicio, tempo.type).value))
+    i1 = len(instantes) if fim is None else int(np.searchsorted(instantes, _como_escalar(fim, tempo.type).value))
+    return tabela.slice(i0, max(i1 - i0, 0))
+
+
+def ler_serie(caminho, colunas=None, inicio=None, fim=None, coluna_tempo=COLUNA_TEMPO):
+    """
+    Lê a fatia [inicio, fim) de uma série temporal, apenas com as colunas pedidas.
+
+    Args:
+    - caminho (str): Arquivo Parquet (ou diretório de Parquets) ou Arrow IPC/Feather.
+    - colunas (list[str] | None): Colunas desejadas; a coluna de tempo é sempre incluída.
+    - inicio, fim (str | datetime | None): Limites do intervalo (fim exclusivo).
+    - coluna_tempo (str): Nome da coluna de tempo.
+
+    Returns:
+    - pyarrow.Table: A fatia pedida. Use `.to_pandas()` para montar os gráficos.
+    """
+    fonte = abrir(caminho)
+    if colunas is not None:
+        colunas = [coluna_tempo] + [c for c in colunas if c != coluna_tempo]
+
+    if isinstance(fonte, pa.Table):
+        tabela = fonte if colunas is None else fonte.select(colunas)
+        if inicio is None and fim is None:
+            return tabela
+        return _fatiar_ordenada(tabela, coluna_tempo, inicio, fim)
+
+    # Parquet: o filtro é empurrado para o leitor, que pula os row groups cujas
+    # estatísticas estão fora do intervalo e só decodifica as colunas projetadas.
+    tipo = fonte.schema.field(coluna_tempo).type
+    filtro = _filtro_tempo(pc.field(coluna_tempo), tipo, inicio, fim)
+    return fonte.to_table(columns=colunas, filter=filtro)
+
+
+def ler_blocos(caminho, colunas=None, linhas_por_bloco=LINHAS_POR_GRUPO, inicio=None, fim=None, coluna_tempo=COLUNA_TEMPO):
+    """
+    Lê a fatia [inicio, fim) de uma série em blocos, sem carregar o arquivo inteiro.
+
+    Todos os blocos têm `linhas_por_bloco` linhas (o último pode ser menor), então dois
+    arquivos com os mesmos instantes são percorridos em blocos alinhados.
+
+    Args:
+    - caminho, colunas, inicio, fim, coluna_tempo: Ver `ler_serie`.
+    - linhas_por_bloco (int): Linhas por bloco.
+
+    Yields:
+    - pyarrow.Table: Blocos consecutivos da série.
+    """
+    fonte = abrir(caminho)
+    if isinstance(fonte, pa.Table):
+        # Arrow IPC já está mapeado em memória: os blocos são slices sem cópia.
+        tabela = ler_serie(caminho, colunas, inicio, fim, coluna_tempo)
+        for i in range(0, tabela.num_rows, linhas_por_bloco):
+            yield tabela.slice(i, linhas_por_bloco)
+        return
+
+    if colunas is not None:
+        colunas = [coluna_tempo] + [c for c in colunas if c != coluna_tempo]
+    filtro = _filtro_tempo(pc.field(coluna_tempo), fonte.schema.field(coluna_tempo).type, inicio, fim)
+    # O leitor decodifica um row group por vez (sem ler adiantado o resto do arquivo) e
+    # devolve lotes de tamanhos variados; eles são reagrupados para que cada bloco tenha
+    # exatamente `linhas_por_bloco` linhas.
+    pendentes, n_pendentes = [], 0
+    lotes = fonte.to_batches(
+        columns=colunas, filter=filtro, batch_size=linhas_por_bloco, batch_readahead=1, fragment_readahead=1,
+    )
+    for lote in lotes:
+        pendentes.append(lote)
+        n_pendentes += lote.num_rows
+        while n_pendentes >= linhas_por_bloco:
+            tabela = pa.Table.from_batches(pendentes)
+            yield tabela.slice(0, linhas_por_bloco)
+            resto = tabela.slice(linhas_por_bloco)
+            pendentes, n_pendentes = resto.to_batches(), resto.num_rows
+    if n_pendentes:
+        yield pa.Table.from_batches(pendentes)
+
+
+def escrever_serie(dados, caminho, coluna_tempo=COLUNA_TEMPO):
+    """
+    Grava uma série no formato esperado por `ler_serie` (ordenada pelo tempo).
+
+    Args:
+    - dados (pandas.DataFrame | pyarrow.Table): Série com a coluna de tempo.
+    - caminho (str): Destino; a extensão define o formato (Parquet ou Arrow IPC).
+    - coluna_tempo (str): Nome da coluna de tempo.
+    """
+    tabela = dados if isinstance(dados, pa.Table) else pa.Table.from_pandas(dados, preserve_index=False)
+    tabela = tabela.sort_by(coluna_tempo)
+    if _formato(caminho) == "ipc":
+        # Sem compressão e em um único bloco, para permitir a leitura sem cópia via mmap.
+        with pa.OSFile(caminho, "wb") as destino, ipc.new_file(destino, tabela.schema) as escritor:
+            escritor.write_table(tabela.combine_chunks(), max_chunksize=tabela.num_rows or None)
+    else:
+        pq.write_table(tabela, caminho, row_group_size=LINHAS_POR_GRUPO)
@@ -0,0 +1,170 @@
+"""
+Redução de pontos (decimação) das séries antes de enviá-las ao Plotly.
+
+Séries longas (um ano em 1 min, por exemplo) são reduzidas para alguns milhares de
+pontos visualmente fiéis. Assim, o tamanho do gráfico enviado ao navegador e o tempo
+de renderização deixam de crescer com o tamanho da série.
+
+- **min-max:** Mantém o mínimo e o máximo de cada intervalo. Preserva os picos
+  exatamente, o que é essencial para gráficos de demanda e Peak Shaving.
+- **LTTB (Largest-Triangle-Three-Buckets):** Escolhe em cada intervalo o ponto que forma
+  o maior triângulo com os vizinhos, preservando melhor a forma visual da curva.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from . import instrumentacao
+
+
+PONTOS_MAX = 4000
+METODOS = ("minmax", "lttb")
+
+# Cache por "nível de zoom": (série, faixa do eixo x, nº de pontos, método).
+_CACHE_MAX = 64
+# Compartilhado pelas threads das sessões do Streamlit, por isso protegido por uma trava.
+_cache = OrderedDict()
+_trava = threading.Lock()
+
+
+def _eixo_numerico(x):
+    # Datas viram inteiros (ns) para que o eixo x possa entrar nas contas do LTTB.
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    return x.astype(np.float64, copy=False)
+
+
+def indices_minmax(y, n_pontos):
+    """
+    Índices dos pontos de mínimo e máximo de cada intervalo (totalmente vetorizado).
+
+    Args:
+    - y (array): Valores da série.
+    - n_pontos (int): Nº aproximado de pontos desejados (2 por intervalo).
+
+    Returns:
+    - numpy.ndarray: Índices ordenados, incluindo o primeiro e o último ponto.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= n_pontos:
+        return np.arange(n)
+    n_intervalos = max(n_pontos // 2 - 1, 1)
+    tamanho = -(-n // n_intervalos)
+    # Completa o final repetindo o último valor para poder usar reshape.
+    blocos = np.pad(y, (0, n_intervalos * tamanho - n), mode="edge").reshape(n_intervalos, tamanho)
+    base = np.arange(n_intervalos) * tamanho
+    indices = np.concatenate([base + blocos.argmin(axis=1), base + blocos.argmax(axis=1), [0, n - 1]])
+    return np.unique(np.minimum(indices, n - 1))
+
+
+def indices_lttb(x, y, n_pontos):
+    """
+    Índices escolhidos pelo algoritmo LTTB.
+
+    Cada intervalo depende do ponto escolhido no anterior, então o laço percorre os
+    intervalos (alguns milhares), mas a busca dentro de cada intervalo é vetorizada.
+
+    Args:
+    - x (array): Eixo x (numérico ou datas).
+    - y (array): Valores da série.
+    - n_pontos (int): Nº de pontos desejados (mínimo 3).
+
+    Returns:
+    - numpy.ndarray: Índices ordenados, incluindo o primeiro e o último ponto.
+    """
+    x = _eixo_numerico(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= n_pontos or n_pontos < 3:
+        return np.arange(n)
+
+    bordas = np.linspace(1, n - 1, n_pontos - 1).astype(np.int64)
+    # Médias de cada intervalo (usadas como terceiro vértice do triângulo).
+    soma_x = np.add.reduceat(x[1:n - 1], bordas[:-1] - 1)
+    soma_y = np.add.reduceat(y[1:n - 1], bordas[:-1] - 1)
+    tamanhos = np.diff(bordas)
+    media_x = np.append(soma_x / tamanhos, x[n - 1])
+    media_y = np.append(soma_y / tamanhos, y[n - 1])
+
+    indices = np.empty(n_pontos, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_pontos - 2):
+        inicio, fim = bordas[i], bordas[i + 1]
+        xb, yb = x[inicio:fim], y[inicio:fim]
+        area = np.abs((x[a] - media_x[i + 1]) * (yb - y[a]) - (x[a] - xb) * (media_y[i + 1] - y[a]))
+        a = inicio + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
+
+def _impressao(df, x, colunas):
+    # Impressão digital do conteúdo: a chave do cache muda se os dados mudarem.
+    h = hashlib.blake2b(digest_size=16)
+    for coluna in [x, *colunas]:
+        valores = np.ascontiguousarray(df[coluna].to_numpy())
+        h.update(coluna.encode())
+        h.update(str(valores.dtype).encode())
+        h.update(valores.view(np.uint8) if valores.dtype != object else str(valores.tolist()).encode())
+    return h.hexdigest()
+
+
+def reduzir(df, x, colunas, n_pontos=PONTOS_MAX, metodo="minmax", faixa=None, identidade=None):
+    """
+    Reduz um DataFrame para ~`n_pontos` por série, mantendo um eixo x comum.
+
+    Os índices escolhidos para cada coluna são unidos, então gráficos empilhados
+    (como o `px.area` do Peak Shaving) continuam alinhados.
+
+    Args:
+    - df (pandas.DataFrame): Dados ordenados pela coluna `x`.
+    - x (str): Coluna do eixo x.
+    - colunas (list[str]): Colunas de valores a preservar.
+    - n_pontos (int): Nº aproximado de pontos por coluna.
+    - metodo (str): "minmax" ou "lttb".
+    - faixa (tuple | None): Janela (x0, x1) visível, ou seja, o nível de zoom.
+    - identidade (hashable | None): Identificação barata dos dados (ex.: arquivo + mtime, ou
+      as entradas da simulação que gerou `df`), que deve mudar sempre que os dados mudarem.
+      Sem ela, a chave do cache é o hash de todo o conteúdo das colunas, refeito a cada chamada.
+
+    Returns:
+    - pandas.DataFrame: Subconjunto das linhas de `df` (apenas `x` e `colunas`).
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método de decimação desconhecido: {metodo!r} (use {METODOS})")
+    colunas = list(colunas)
+    if faixa is None and len(df) <= n_pontos:
+        return df[[x, *colunas]]
+
+    dados = ("id", identidade, x, tuple(colunas)) if identidade is not None else _impressao(df, x, colunas)
+    chave = (dados, faixa, n_pontos, metodo)
+    with _trava:
+        if chave in _cache:
+            _cache.move_to_end(chave)
+            instrumentacao.contar("decimacao: acertos")
+            return _cache[chave]
+    instrumentacao.contar("decimacao: faltas")
+
+    janela = df[[x, *colunas]]
+    if faixa is not None:
+        janela = janela[(janela[x] >= faixa[0]) & (janela[x] <= faixa[1])]
+
+    if len(janela) <= n_pontos:
+        reduzido = janela
+    else:
+        indices = [
+            indices_minmax(janela[c], n_pontos) if metodo == "minmax" else indices_lttb(janela[x], janela[c], n_pontos)
+            for c in colunas
+        ]
+        reduzido = janela.iloc[np.unique(np.concatenate(indices))]
+
+    with _trava:
+        _cache[chave] = reduzido
+        _cache.move_to_end(chave)
+        while len(_cache) > _CACHE_MAX:
+            _cache.popitem(last=False)
+    return reduzido
@@ -0,0 +1,188 @@
+"""
+Instrumentação opcional das páginas: cronômetros, contadores e exportação de traces.
+
+Não depende do Streamlit: os núcleos do pacote registram aqui os seus contadores (acertos
+e faltas dos caches), e as páginas, os tempos de cada seção.
+
+Ativada com a variável de ambiente `BESS_PERFIL=1` (ex.: `BESS_PERFIL=1 streamlit run
+streamlit_app.py`). Desativada, o custo é praticamente zero: `medido` devolve a própria
+função, sem envoltório, e `medir` devolve um contexto vazio compartilhado.
+
+Com a instrumentação ativa, cada execução da página registra o tempo de cada seção
+(`bms`, `pcs_detalhado`, ...), das chamadas pesadas (`melt`, `px.area`, `st.image`, ...)
+e pode ser exportada como trace do Chrome (chrome://tracing, Perfetto) ou texto OpenMetrics.
+"""
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+
+ATIVO = os.environ.get("BESS_PERFIL", "").lower() in ("1", "true", "sim")
+
+# Chamadas do Streamlit cronometradas quando a instrumentação está ativa.
+CHAMADAS_STREAMLIT = ("image", "dataframe", "table", "plotly_chart", "latex")
+
+_NULO = contextlib.nullcontext()
+_local = threading.local()
+_trava = threading.Lock()
+# Totais do processo (todas as sessões): nome -> [chamadas, segundos, máximo].
+_totais = {}
+_contadores = {}
+
+
+def _eventos():
+    eventos = getattr(_local, "eventos", None)
+    if eventos is None:
+        eventos = _local.eventos = []
+        _local.profundidade = 0
+        _local.inicio = time.perf_counter_ns()
+    return eventos
+
+
+def _registrar(nome, inicio_ns, duracao_ns, profundidade):
+    _eventos().append((nome, inicio_ns, duracao_ns, profundidade, threading.get_ident()))
+    segundos = duracao_ns / 1e9
+    with _trava:
+        total = _totais.setdefault(nome, [0, 0.0, 0.0])
+        total[0] += 1
+        total[1] += segundos
+        total[2] = max(total[2], segundos)
+
+
+class _Cronometro:
+    __slots__ = ("nome", "inicio")
+
+    def __init__(self, nome):
+        self.nome = nome
+
+    def __enter__(self):
+        _eventos()
+        _local.profundidade += 1
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *excecao):
+        fim = time.perf_counter_ns()
+        _local.profundidade -= 1
+        _registrar(self.nome, self.inicio, fim - self.inicio, _local.profundidade)
+        return False
+
+
+def medir(nome):
+    """
+    Cronometra um trecho de código:
+
+        with instrumentacao.medir("peak_shaving: px.area"):
+            fig = px.area(...)
+    """
+    return _Cronometro(nome) if ATIVO else _NULO
+
+
+def medido(nome=None):
+    """Decorador que cronometra cada chamada da função (sem efeito se desativado)."""
+    def decorador(funcao):
+        if not ATIVO:
+            return funcao
+        rotulo = nome or funcao.__name__
+
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            with _Cronometro(rotulo):
+                return funcao(*args, **kwargs)
+        return envoltorio
+    return decorador
+
+
+def contar(nome, quantidade=1):
+    """Incrementa um contador do processo (ex.: acertos de cache)."""
+    if not ATIVO:
+        return
+    with _trava:
+        _contadores[nome] = _contadores.get(nome, 0) + quantidade
+
+
+def contadores():
+    """Cópia dos contadores do processo, ordenados pelo nome."""
+    with _trava:
+        return dict(sorted(_contadores.items()))
+
+
+def instrumentar_streamlit(st):
+    """Envolve as chamadas pesadas do Streamlit (`st.image`, `st.plotly_chart`, ...) com cronômetros."""
+    if not ATIVO or getattr(st, "_bess_instrumentado", False):
+        return
+    for chamada in CHAMADAS_STREAMLIT:
+        setattr(st, chamada, medido(f"st.{chamada}")(getattr(st, chamada)))
+    st._bess_instrumentado = True
+
+
+def iniciar_execucao():
+    """Descarta os eventos da execução anterior desta thread (chamar no início do script)."""
+    _local.eventos = []
+    _local.profundidade = 0
+    _local.inicio = time.perf_counter_ns()
+
+
+def eventos_execucao():
+    """
+    Eventos da execução atual da página.
+
+    Returns:
+    - list[dict]: Um dict por trecho medido, com 'nome', 'inicio_ms', 'duracao_ms' e 'nivel'.
+    """
+    inicio = getattr(_local, "inicio", 0)
+    return [
+        {"nome": nome, "inicio_ms": (t0 - inicio) / 1e6, "duracao_ms": dur / 1e6, "nivel": nivel}
+        for nome, t0, dur, nivel, _ in _eventos()
+    ]
+
+
+def duracao_execucao_ms():
+    """Tempo desde o início da execução atual da página (ms)."""
+    _eventos()
+    return (time.perf_counter_ns() - _local.inicio) / 1e6
+
+
+def trace_chrome():
+    """Trace da execução atual no formato JSON do Chrome (eventos completos, "ph": "X")."""
+    eventos = [
+        {"name": nome, "cat": "bess", "ph": "X", "ts": t0 / 1e3, "dur": dur / 1e3, "pid": os.getpid(), "tid": tid}
+        for nome, t0, dur, _, tid in _eventos()
+    ]
+    return json.dumps({"traceEvents": eventos, "displayTimeUnit": "ms"})
+
+
+def _escapar(valor):
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def openmetrics():
+    """Totais do processo (todas as sessões) no formato de texto OpenMetrics."""
+    with _trava:
+        totais = {nome: list(valores) for nome, valores in _totais.items()}
+        contadores = dict(_contadores)
+    linhas = [
+        "# TYPE bess_secao_chamadas counter",
+        "# HELP bess_secao_chamadas Número de execuções de cada trecho medido.",
+    ]
+    linhas += [f'bess_secao_chamadas_total{{secao="{_escapar(n)}"}} {v[0]}' for n, v in sorted(totais.items())]
+    linhas += [
+        "# TYPE bess_secao_duracao_seconds counter",
+        "# UNIT bess_secao_duracao_seconds seconds",
+        "# HELP bess_secao_duracao_seconds Tempo acumulado em cada trecho medido.",
+    ]
+    linhas += [f'bess_secao_duracao_seconds_total{{secao="{_escapar(n)}"}} {v[1]:.6f}' for n, v in sorted(totais.items())]
+    linhas += [
+        "# TYPE bess_secao_duracao_max_seconds gauge",
+        "# UNIT bess_secao_duracao_max_seconds seconds",
+        "# HELP bess_secao_duracao_max_seconds Maior duração observada de cada trecho medido.",
+    ]
+    linhas += [f'bess_secao_duracao_max_seconds{{secao="{_escapar(n)}"}} {v[2]:.6f}' for n, v in sorted(totais.items())]
+    if contadores:
+        linhas += ["# TYPE bess_contador counter", "# HELP bess_contador Contadores registrados com contar()."]
+        linhas += [f'bess_contador_total{{nome="{_escapar(n)}"}} {v}' for n, v in sorted(contadores.items())]
+    linhas.append("# EOF")
+    return "\n".join(linhas) + "\n"
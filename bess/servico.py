@@ -0,0 +1,413 @@
+"""
+Serviço HTTP local (asyncio, só biblioteca padrão) com as simulações de Peak Shaving e de SoC.
+
+    python -m bess.servico --porta 8765
+
+Rotas (POST com corpo JSON, respostas em JSON):
+- **/peak-shaving:** `demanda` (MW) e os parâmetros de `simulacao.despachar`
+  (`potencia_mw`, `energia_mwh`, `eficiencia`, `limiar_mw`, `soc_inicial`, `passo_h`).
+- **/soc:** `potencia` (MW) e os parâmetros de `simulacao.simular_soc`
+  (`capacidade_mwh`, `soc_inicial`, `eficiencia`, `passo_h`).
+- **GET /saude:** Estado do serviço e contadores.
+
+Requisições que chegam quase juntas são agrupadas em uma única chamada vetorizada:
+as de Peak Shaving com a mesma demanda viram um despacho com P combinações de
+parâmetros, e as de SoC com séries do mesmo tamanho viram uma varredura (B, T). Os lotes
+rodam em um pool de threads com um limite de execuções simultâneas, e os resultados
+ficam no cache de `cache_resultados`, indexados pelo hash das entradas; requisições
+idênticas em andamento compartilham o mesmo cálculo.
+
+`ClienteLocal` chama o serviço no próprio processo, sem rede, para testes; `Cliente` fala
+HTTP com um serviço em execução.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+from . import cache_resultados, simulacao
+
+
+VERSAO = "1"
+JANELA_LOTE_S = 0.005
+MAX_LOTE = 256
+MAX_CORPO_BYTES = 64 * 1024 * 1024
+
+PARAMETROS_PEAK_SHAVING = {'potencia_mw': None, 'energia_mwh': None, 'eficiencia': 0.9, 'limiar_mw': 0.0, 'soc_inicial': 1.0}
+PARAMETROS_SOC = {'capacidade_mwh': None, 'soc_inicial': 0.5, 'eficiencia': 0.9, 'passo_h': 1.0}
+# Faixa válida dos parâmetros: (mínimo, máximo, mínimo incluído); os demais só precisam ser finitos.
+FAIXAS = {
+    'potencia_mw': (0.0, math.inf, True),
+    'energia_mwh': (0.0, math.inf, True),
+    'capacidade_mwh': (0.0, math.inf, False),
+    'eficiencia': (0.0, 1.0, False),
+    'soc_inicial': (0.0, 1.0, True),
+    'passo_h': (0.0, math.inf, False),
+}
+# Threads para o cache (leitura e gravação no SQLite), separadas das que executam os lotes.
+TRABALHADORES_CACHE = 4
+
+_AUSENTE = object()
+
+
+class ErroRequisicao(ValueError):
+    """Corpo da requisição inválido (resposta 400)."""
+
+
+def _serie(corpo, campo):
+    try:
+        serie = np.asarray(corpo[campo], dtype=float)
+    except KeyError:
+        raise ErroRequisicao(f"Campo obrigatório ausente: {campo!r}") from None
+    except (TypeError, ValueError):
+        raise ErroRequisicao(f"{campo!r} deve ser uma lista de números") from None
+    if serie.ndim != 1 or len(serie) == 0:
+        raise ErroRequisicao(f"{campo!r} deve ser uma lista de números não vazia")
+    if not np.isfinite(serie).all():
+        raise ErroRequisicao(f"{campo!r} deve conter apenas números finitos")
+    return serie
+
+
+def _parametros(corpo, padroes):
+    valores = {}
+    for nome, padrao in padroes.items():
+        valor = corpo.get(nome, padrao)
+        if valor is None:
+            raise ErroRequisicao(f"Campo obrigatório ausente: {nome!r}")
+        try:
+            valor = float(valor)
+        except (TypeError, ValueError):
+            raise ErroRequisicao(f"{nome!r} deve ser um número") from None
+        if not math.isfinite(valor):
+            raise ErroRequisicao(f"{nome!r} deve ser um número finito")
+        minimo, maximo, incluido = FAIXAS.get(nome, (-math.inf, math.inf, True))
+        if not ((valor >= minimo if incluido else valor > minimo) and valor <= maximo):
+            raise ErroRequisicao(f"{nome!r} deve estar em {'[' if incluido else '('}{minimo:g}, {maximo:g}]")
+        valores[nome] = valor
+    return valores
+
+
+def _lote_peak_shaving(demanda, passo_h, pedidos):
+    # Um único despacho para todo o lote: cada pedido é uma combinação do eixo de parâmetros.
+    colunas = {nome: np.array([p[nome] for p in pedidos]) for nome in PARAMETROS_PEAK_SHAVING}
+    rede, bess, soc = simulacao.despachar(
+        demanda, colunas['potencia_mw'], colunas['energia_mwh'], colunas['eficiencia'], colunas['limiar_mw'],
+        soc_inicial=colunas['soc_inicial'], passo_h=passo_h,
+    )
+    pico = demanda.max()
+    return [
+        {
+            'rede_mw': rede[i].tolist(),
+            'bess_mw': bess[i].tolist(),
+            'soc': soc[i].tolist(),
+            'pico_rede_mw': float(rede[i].max()),
+            'reducao_pico_mw': float(pico - rede[i].max()),
+            'energia_descarregada_mwh': float(np.clip(bess[i], 0.0, None).sum() * passo_h),
+        }
+        for i in range(len(pedidos))
+    ]
+
+
+def _lote_soc(pedidos):
+    # Séries do mesmo tamanho resolvidas juntas: potência (B, T) e um parâmetro por linha (B, 1).
+    potencia = np.stack([p['potencia'] for p in pedidos])
+    colunas = {nome: np.array([[p[nome]] for p in pedidos]) for nome in PARAMETROS_SOC}
+    soc = simulacao.simular_soc(
+        potencia, colunas['capacidade_mwh'], colunas['soc_inicial'], colunas['eficiencia'], colunas['passo_h']
+    )
+    return [{'soc': linha.tolist()} for linha in soc]
+
+
+class _Agrupador:
+    """
+    Junta os pedidos de um mesmo grupo que chegam dentro de `janela_s` e os executa
+    como um lote, no pool de threads e sob o semáforo do serviço.
+    """
+
+    def __init__(self, executar_lote, servico, janela_s, max_lote):
+        self._executar_lote = executar_lote
+        self._servico = servico
+        self._janela_s = janela_s
+        self._max_lote = max_lote
+        self._pendentes = {}  # grupo -> (pedidos, futuros, temporizador, contexto)
+        self._lotes = set()  # Referências aos lotes em execução (o asyncio só guarda referências fracas).
+
+    async def submeter(self, grupo, contexto, pedido):
+        loop = asyncio.get_running_loop()
+        futuro = loop.create_future()
+        if grupo not in self._pendentes:
+            temporizador = loop.call_later(self._janela_s, self._disparar, grupo)
+            self._pendentes[grupo] = ([], [], temporizador, contexto)
+        pedidos, futuros, _, _ = self._pendentes[grupo]
+        pedidos.append(pedido)
+        futuros.append(futuro)
+        if len(pedidos) >= self._max_lote:
+            self._disparar(grupo)
+        return await futuro
+
+    def _disparar(self, grupo):
+        pedidos, futuros, temporizador, contexto = self._pendentes.pop(grupo)
+        temporizador.cancel()
+        lote = asyncio.ensure_future(self._executar(contexto, pedidos, futuros))
+        self._lotes.add(lote)
+        lote.add_done_callback(self._lotes.discard)
+
+    async def _executar(self, contexto, pedidos, futuros):
+        servico = self._servico
+        async with servico._semaforo:
+            servico.estatisticas['lotes'] += 1
+            servico.estatisticas['pedidos_em_lote'] += len(pedidos)
+            loop = asyncio.get_running_loop()
+            try:
+                resultados = await loop.run_in_executor(servico._executor, self._executar_lote, *contexto, pedidos)
+            except Exception as excecao:  # O erro de um lote é devolvido a todos os seus pedidos.
+                for futuro in futuros:
+                    if not futuro.done():
+                        futuro.set_exception(excecao)
+                return
+        for futuro, resultado in zip(futuros, resultados):
+            if not futuro.done():
+                futuro.set_result(resultado)
+
+
+class ServicoSimulacao:
+    """
+    Núcleo do serviço, independente do transporte: recebe (método, rota, corpo) e devolve
+    (status, resposta).
+
+    Args:
+    - max_trabalhadores (int | None): Lotes executados ao mesmo tempo (threads); padrão é o nº de CPUs.
+    - janela_lote_s (float): Tempo que o primeiro pedido de um lote espera por outros.
+    - max_lote (int): Pedidos por lote; um lote cheio é executado na hora.
+    - armazem (ArmazemResultados | None): Cache dos resultados; padrão é `armazem_padrao()`.
+    """
+
+    def __init__(self, max_trabalhadores=None, janela_lote_s=JANELA_LOTE_S, max_lote=MAX_LOTE, armazem=None):
+        self.max_trabalhadores = max_trabalhadores or os.cpu_count() or 1
+        self.armazem = armazem if armazem is not None else cache_resultados.armazem_padrao()
+        self.estatisticas = {'requisicoes': 0, 'acertos_cache': 0, 'compartilhadas': 0, 'lotes': 0, 'pedidos_em_lote': 0}
+        self._executor = ThreadPoolExecutor(max_workers=self.max_trabalhadores, thread_name_prefix="bess-servico")
+        self._executor_cache = ThreadPoolExecutor(max_workers=TRABALHADORES_CACHE, thread_name_prefix="bess-cache")
+        self._semaforo = asyncio.Semaphore(self.max_trabalhadores)
+        self._em_andamento = {}
+        self._agrupadores = {
+            '/peak-shaving': _Agrupador(_lote_peak_shaving, self, janela_lote_s, max_lote),
+            '/soc': _Agrupador(_lote_soc, self, janela_lote_s, max_lote),
+        }
+
+    def _preparar(self, rota, corpo):
+        # Devolve (chave do cache, grupo do lote, contexto do lote, pedido).
+        if rota == '/peak-shaving':
+            demanda = _serie(corpo, 'demanda')
+            passo_h = _parametros(corpo, {'passo_h': 1.0})['passo_h']
+            parametros = _parametros(corpo, PARAMETROS_PEAK_SHAVING)
+            id_demanda = cache_resultados.chave("demanda", "", demanda)
+            chave = cache_resultados.chave("servico.peak_shaving", VERSAO, id_demanda, passo_h, parametros)
+            return chave, (id_demanda, passo_h), (demanda, passo_h), parametros
+        potencia = _serie(corpo, 'potencia')
+        parametros = _parametros(corpo, PARAMETROS_SOC)
+        chave = cache_resultados.chave("servico.soc", VERSAO, potencia, parametros)
+        return chave, len(potencia), (), {'potencia': potencia, **parametros}
+
+    async def tratar(self, metodo, rota, corpo=None):
+        """
+        Atende uma requisição.
+
+        Returns:
+        - tuple[int, dict]: Status HTTP e corpo da resposta.
+        """
+        self.estatisticas['requisicoes'] += 1
+        if rota == '/saude' and metodo == 'GET':
+            return HTTPStatus.OK, {'status': 'ok', 'max_trabalhadores': self.max_trabalhadores, **self.estatisticas}
+        if rota not in self._agrupadores:
+            return HTTPStatus.NOT_FOUND, {'erro': f"Rota desconhecida: {rota}"}
+        if metodo != 'POST':
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'erro': "Use POST com um corpo JSON"}
+        if not isinstance(corpo, dict):
+            return HTTPStatus.BAD_REQUEST, {'erro': "O corpo deve ser um objeto JSON"}
+
+        try:
+            chave, grupo, contexto, pedido = self._preparar(rota, corpo)
+        except ErroRequisicao as excecao:
+            return HTTPStatus.BAD_REQUEST, {'erro': str(excecao)}
+
+        # Pedidos idênticos em andamento esperam o mesmo cálculo.
+        tarefa = self._em_andamento.get(chave)
+        if tarefa is None:
+            # O cache lê do SQLite e desserializa: fora do laço de eventos, para não travar as conexões.
+            loop = asyncio.get_running_loop()
+            resultado = await loop.run_in_executor(self._executor_cache, self.armazem.obter, chave, _AUSENTE)
+            if resultado is not _AUSENTE:
+                self.estatisticas['acertos_cache'] += 1
+                return HTTPStatus.OK, resultado
+            tarefa = self._em_andamento.get(chave)  # Pode ter começado durante a consulta.
+        if tarefa is not None:
+            self.estatisticas['compartilhadas'] += 1
+        else:
+            tarefa = asyncio.ensure_future(self._calcular(rota, chave, grupo, contexto, pedido))
+            self._em_andamento[chave] = tarefa
+        try:
+            return HTTPStatus.OK, await asyncio.shield(tarefa)
+        except Exception as excecao:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'erro': f"{type(excecao).__name__}: {excecao}"}
+
+    async def _calcular(self, rota, chave, grupo, contexto, pedido):
+        try:
+            resultado = await self._agrupadores[rota].submeter(grupo, contexto, pedido)
+        except BaseException:
+            self._em_andamento.pop(chave, None)
+            raise
+        # A gravação no cache roda em segundo plano; até ela terminar, pedidos idênticos
+        # recebem o resultado da tarefa concluída, que continua em `_em_andamento`.
+        loop = asyncio.get_running_loop()
+        gravacao = loop.run_in_executor(self._executor_cache, self.armazem.guardar, chave, resultado)
+        gravacao.add_done_callback(lambda _: self._em_andamento.pop(chave, None))
+        return resultado
+
+    def encerrar(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor_cache.shutdown(wait=True)
+
+
+def _resposta(status, corpo, manter):
+    dados = json.dumps(corpo, ensure_ascii=False).encode()
+    cabecalho = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(dados)}\r\n"
+        f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n"
+    )
+    return cabecalho.encode() + dados
+
+
+async def _atender_conexao(servico, leitor, escritor):
+    try:
+        while True:
+            linha = await leitor.readline()
+            if not linha:
+                break
+            try:
+                metodo, caminho, versao = linha.decode("latin-1").split()
+            except ValueError:
+                escritor.write(_resposta(HTTPStatus.BAD_REQUEST, {'erro': "Linha de requisição inválida"}, False))
+                break
+            cabecalhos = {}
+            while (linha := await leitor.readline()) not in (b"\r\n", b"\n", b""):
+                nome, _, valor = linha.decode("latin-1").partition(":")
+                cabecalhos[nome.strip().lower()] = valor.strip()
+            manter = versao == "HTTP/1.1" and cabecalhos.get("connection", "").lower() != "close"
+
+            try:
+                tamanho = int(cabecalhos.get("content-length", 0) or 0)
+            except ValueError:
+                tamanho = -1
+            if tamanho < 0:
+                # Sem um tamanho válido não há como achar o fim do corpo: responde e fecha.
+                escritor.write(_resposta(HTTPStatus.BAD_REQUEST, {'erro': "Content-Length inválido"}, False))
+                break
+            if tamanho > MAX_CORPO_BYTES:
+                escritor.write(_resposta(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'erro': "Corpo grande demais"}, False))
+                break
+            bruto = await leitor.readexactly(tamanho) if tamanho else b""
+            try:
+                corpo = json.loads(bruto) if bruto else None
+            except json.JSONDecodeError:
+                status, resposta = HTTPStatus.BAD_REQUEST, {'erro': "JSON inválido"}
+            else:
+                status, resposta = await servico.tratar(metodo, caminho.split("?")[0], corpo)
+            escritor.write(_resposta(status, resposta, manter))
+            await escritor.drain()
+            if not manter:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        escritor.close()
+
+
+async def iniciar(servico, host="127.0.0.1", porta=8765):
+    """Inicia o servidor HTTP do serviço (devolve o `asyncio.Server`; porta 0 escolhe uma livre)."""
+    return await asyncio.start_server(lambda l, e: _atender_conexao(servico, l, e), host, porta)
+
+
+class ClienteLocal:
+    """Cliente no mesmo processo, sem rede: chama `ServicoSimulacao.tratar` diretamente."""
+
+    def __init__(self, servico=None):
+        self.servico = servico or ServicoSimulacao()
+
+    async def chamar(self, rota, corpo=None, metodo="POST"):
+        """
+        Returns:
+        - tuple[int, dict]: Status HTTP e resposta, como o serviço HTTP devolveria.
+        """
+        # Passa pelo JSON como na rede, para que o teste veja exatamente o que um cliente HTTP veria.
+        corpo = json.loads(json.dumps(corpo)) if corpo is not None else None
+        status, resposta = await self.servico.tratar(metodo, rota, corpo)
+        return int(status), json.loads(json.dumps(resposta))
+
+    async def peak_shaving(self, demanda, **parametros):
+        return await self.chamar('/peak-shaving', {'demanda': list(demanda), **parametros})
+
+    async def soc(self, potencia, **parametros):
+        return await self.chamar('/soc', {'potencia': list(potencia), **parametros})
+
+
+class Cliente:
+    """Cliente HTTP síncrono para um serviço em execução (ex.: `Cliente("http://127.0.0.1:8765")`)."""
+
+    def __init__(self, url="http://127.0.0.1:8765", tempo_limite_s=60):
+        self.url = url.rstrip("/")
+        self.tempo_limite_s = tempo_limite_s
+
+    def chamar(self, rota, corpo=None):
+        dados = json.dumps(corpo).encode() if corpo is not None else None
+        pedido = urllib.request.Request(
+            self.url + rota, data=dados, method="POST" if dados is not None else "GET",
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(pedido, timeout=self.tempo_limite_s) as resposta:
+                return resposta.status, json.load(resposta)
+        except urllib.error.HTTPError as erro:
+            return erro.code, json.load(erro)
+
+    def peak_shaving(self, demanda, **parametros):
+        return self.chamar('/peak-shaving', {'demanda': list(demanda), **parametros})
+
+    def soc(self, potencia, **parametros):
+        return self.chamar('/soc', {'potencia': list(potencia), **parametros})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bess.servico", description="Serviço HTTP local com as simulações do BESS.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--trabalhadores", type=int, default=None, help="Lotes executados ao mesmo tempo.")
+    args = parser.parse_args(argv)
+
+    async def executar():
+        servico = ServicoSimulacao(max_trabalhadores=args.trabalhadores)
+        servidor = await iniciar(servico, args.host, args.porta)
+        print(f"Serviço em http://{args.host}:{args.porta} ({servico.max_trabalhadores} trabalhadores)")
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            servico.encerrar()
+
+    try:
+        asyncio.run(executar())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
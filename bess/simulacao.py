@@ -0,0 +1,142 @@
+"""
+Simulações do BESS, separadas da interface do Streamlit.
+
+As funções recebem e devolvem dados (listas, arrays, DataFrames) e não chamam `st.*`,
+para que possam ser cacheadas, testadas e reaproveitadas fora das páginas.
+"""
+import numpy as np
+import pandas as pd
+from numpy.typing import ArrayLike
+
+from .cache_resultados import resultado_cacheado
+
+
+# Arrays (P, T) de float64 alocados por `despachar`: BESS e SoC no laço e a potência da rede.
+ARRAYS_DESPACHAR = 3
+
+@resultado_cacheado(versao="1")
+def simular_peak_shaving(demanda_total: ArrayLike, horas: ArrayLike | None = None, potencia_pico_bess: float = 150,
+                         potencia_carga_bess: float = 50, horario_pico: tuple[int, int] = (18, 21),
+                         horario_carga: tuple[int, int] = (0, 4)) -> pd.DataFrame:
+    """
+    Simula o despacho de Peak Shaving por janelas de horário.
+
+    Args:
+    - demanda_total (list | array): Demanda da carga em cada hora (MW).
+    - horas (list | array | None): Hora do dia de cada amostra; padrão 0, 1, 2, ...
+    - potencia_pico_bess (float): Potência máxima que o BESS fornece no pico (MW).
+    - potencia_carga_bess (float): Potência com que o BESS carrega na madrugada (MW).
+    - horario_pico (tuple): Horas (inicial, final) de descarga, inclusive.
+    - horario_carga (tuple): Horas (inicial, final) de carga, inclusive.
+
+    Returns:
+    - pandas.DataFrame: Colunas 'Hora', 'Demanda Total (MW)', 'Potência da Rede (MW)'
+      e 'Potência do BESS (MW)' (positiva descarregando, negativa carregando).
+    """
+    demanda = np.asarray(demanda_total, dtype=float)
+    horas = np.arange(len(demanda)) if horas is None else np.asarray(horas)
+
+    pico = (horas >= horario_pico[0]) & (horas <= horario_pico[1])
+    carga = (horas >= horario_carga[0]) & (horas <= horario_carga[1])
+
+    # Pico -> BESS descarrega; madrugada -> BESS carrega (valor negativo); demais -> espera.
+    potencia_bess = np.where(pico, np.minimum(demanda, potencia_pico_bess), np.where(carga, -potencia_carga_bess, 0.0))
+    potencia_rede = demanda - potencia_bess
+
+    return pd.DataFrame({
+        'Hora': horas,
+        'Demanda Total (MW)': demanda,
+        'Potência da Rede (MW)': potencia_rede,
+        'Potência do BESS (MW)': potencia_bess
+    })
+
+
+def despachar(demanda: ArrayLike, potencia_mw: ArrayLike, energia_mwh: ArrayLike, eficiencia: ArrayLike = 0.9,
+              limiar_mw: ArrayLike = 0.0, soc_inicial: ArrayLike = 1.0,
+              passo_h: float = 1.0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Despacho de Peak Shaving por limiar, com limites de potência e de energia (SoC).
+
+    O BESS descarrega o que a demanda ultrapassar o limiar e recarrega com a folga abaixo
+    dele. Os parâmetros do BESS podem ser arrays de tamanho P: o laço percorre o tempo e
+    cada passo é calculado de uma vez para todas as P combinações (eixo de parâmetros).
+
+    Args:
+    - demanda (array): Demanda da carga, tamanho T (MW).
+    - potencia_mw, energia_mwh, eficiencia, limiar_mw (float | array): Potência nominal,
+      capacidade, eficiência de ida e volta e limiar de demanda; escalares ou arrays (P,).
+    - soc_inicial (float): Estado de carga inicial (entre 0 e 1).
+    - passo_h (float): Duração de cada amostra em horas.
+
+    Returns:
+    - tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: Potência da rede, potência do
+      BESS (positiva descarregando) e SoC, cada um com forma (P, T).
+    """
+    demanda = np.asarray(demanda, dtype=float)
+    potencia, energia_max, eta, limiar = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(v, dtype=float)) for v in (potencia_mw, energia_mwh, eficiencia, limiar_mw))
+    )
+    # A eficiência de ida e volta é dividida igualmente entre carga e descarga.
+    eta_unidirecional = np.sqrt(eta)
+    energia = soc_inicial * energia_max
+
+    # Guardado como (T, P) para que cada passo escreva uma linha contígua.
+    bess = np.empty((len(demanda), len(potencia)))
+    soc = np.empty_like(bess)
+    capacidade = np.where(energia_max > 0, energia_max, 1.0)
+
+    for t, demanda_t in enumerate(demanda):
+        excesso = demanda_t - limiar
+        descarga = np.minimum(np.minimum(np.maximum(excesso, 0.0), potencia), energia * eta_unidirecional / passo_h)
+        carga = np.minimum(np.minimum(np.maximum(-excesso, 0.0), potencia), (energia_max - energia) / (eta_unidirecional * passo_h))
+        energia = energia - descarga * passo_h / eta_unidirecional + carga * passo_h * eta_unidirecional
+        bess[t] = descarga - carga
+        soc[t] = energia / capacidade
+
+    bess, soc = bess.T, soc.T
+    return demanda - bess, bess, soc
+
+
+def simular_soc(potencia: ArrayLike, capacidade_mwh: ArrayLike, soc_inicial: ArrayLike = 0.5,
+                eficiencia: ArrayLike = 0.9, passo_h: ArrayLike = 1.0) -> np.ndarray:
+    """
+    Evolução do Estado de Carga ao longo de uma série de potências.
+
+    É a versão vetorizada do exemplo `simular_soc` da página de Equações: a cada passo
+    SoC(t) = clip(SoC(t-1) + ΔSoC(t), 0, 1). Como a composição de funções "soma e satura"
+    é associativa, a série inteira é resolvida com uma varredura paralela de prefixos
+    (log2(T) operações vetorizadas) em vez de um laço em Python.
+
+    Várias séries do mesmo tamanho podem ser resolvidas de uma vez: com `potencia` de
+    forma (B, T), os demais parâmetros podem ser arrays (B, 1), um valor por série.
+
+    Args:
+    - potencia (array): Potência em cada passo, carga (+) ou descarga (-) em MW; (T,) ou (B, T).
+    - capacidade_mwh (float | array): Capacidade total da bateria em MWh.
+    - soc_inicial (float | array): Estado de carga inicial (entre 0 e 1).
+    - eficiencia (float | array): Eficiência de carga/descarga.
+    - passo_h (float | array): Duração de cada passo em horas.
+
+    Returns:
+    - numpy.ndarray: SoC ao final de cada passo (entre 0 e 1), com a forma de `potencia`.
+    """
+    potencia = np.asarray(potencia, dtype=float)
+    potencia_efetiva = np.where(potencia > 0, potencia * eficiencia, potencia / eficiencia)
+
+    # Cada passo é a função x -> min(max(x + a, lo), hi); começa com a = ΔSoC, lo = 0, hi = 1.
+    a = potencia_efetiva * passo_h / capacidade_mwh
+    lo = np.zeros_like(a)
+    hi = np.ones_like(a)
+
+    k = 1
+    while k < a.shape[-1]:
+        # Compõe o passo i com o passo i - k (aplicado antes): soma os deslocamentos e
+        # satura os limites anteriores, deslocados, dentro dos limites atuais.
+        novo_lo = np.clip(lo[..., :-k] + a[..., k:], lo[..., k:], hi[..., k:])
+        novo_hi = np.clip(hi[..., :-k] + a[..., k:], lo[..., k:], hi[..., k:])
+        a[..., k:] += a[..., :-k] # O NumPy trata a sobreposição como se a[..., :-k] fosse copiado antes.
+        lo[..., k:] = novo_lo
+        hi[..., k:] = novo_hi
+        k *= 2
+
+    return np.minimum(np.maximum(soc_inicial + a, lo), hi)
@@ -0,0 +1,273 @@
+"""
+Execução de simulações longas em segundo plano (pool de processos).
+
+O script do Streamlit roda de novo a cada interação; se a simulação rodasse dentro
+dele, a página ficaria congelada e cada mudança de widget recomeçaria o cálculo.
+Aqui as páginas apenas submetem o trabalho, recebem um ID e consultam o estado
+até o resultado ficar pronto.
+
+Dentro da função executada, é possível informar o progresso e atender a pedidos
+de cancelamento:
+
+    def simulacao_longa(n):
+        for i in range(n):
+            ...
+            tarefas.informar_progresso((i + 1) / n, "Simulando...")
+"""
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+
+PENDENTE = "pendente"
+EXECUTANDO = "executando"
+CONCLUIDA = "concluída"
+ERRO = "erro"
+CANCELADA = "cancelada"
+FINALIZADOS = (CONCLUIDA, ERRO, CANCELADA)
+
+MAX_TAREFAS_GUARDADAS = 256
+# Intervalo com que `mapear_lotes` verifica o cancelamento enquanto espera os lotes (s).
+INTERVALO_CANCELAMENTO_S = 0.2
+
+
+class TarefaCancelada(Exception):
+    """Levantada dentro da tarefa quando o cancelamento foi pedido."""
+
+
+@dataclass(frozen=True, slots=True)
+class EstadoTarefa:
+    id: str
+    status: str
+    progresso: float = 0.0
+    mensagem: str = ""
+    erro: str = ""
+
+
+# --- LADO DO PROCESSO DE TRABALHO ---
+# Cada processo do pool executa uma tarefa por vez; o contexto da tarefa atual
+# fica em variáveis do módulo para que a função não precise recebê-lo como argumento.
+_id_atual = None
+_progresso = None
+_cancelados = None
+
+
+def informar_progresso(fracao, mensagem=""):
+    """
+    Publica o progresso da tarefa atual e verifica se ela foi cancelada.
+
+    Fora de uma tarefa (chamada direta da função), não faz nada.
+
+    Args:
+    - fracao (float): Progresso entre 0 e 1.
+    - mensagem (str): Texto curto exibido junto à barra de progresso.
+    """
+    if _id_atual is None:
+        return
+    _progresso[_id_atual] = (min(max(float(fracao), 0.0), 1.0), mensagem)
+    verificar_cancelamento()
+
+
+def verificar_cancelamento():
+    """Levanta `TarefaCancelada` se o cancelamento da tarefa atual foi pedido."""
+    if _id_atual is not None and _id_atual in _cancelados:
+        raise TarefaCancelada(_id_atual)
+
+
+def _executar(id_tarefa, progresso, cancelados, funcao, args, kwargs):
+    global _id_atual, _progresso, _cancelados
+    _id_atual, _progresso, _cancelados = id_tarefa, progresso, cancelados
+    try:
+        verificar_cancelamento()
+        progresso[id_tarefa] = (0.0, "")
+        return funcao(*args, **kwargs)
+    finally:
+        _id_atual = _progresso = _cancelados = None
+
+
+# --- LOTES EM PARALELO ---
+def mapear_lotes(funcao, lotes, max_processos=None, rotulo="Lote"):
+    """
+    Executa `funcao(*argumentos)` para cada lote em um pool de processos ("spawn") e
+    informa o progresso (e atende ao cancelamento) à medida que os lotes terminam.
+
+    Usado por simulações que dividem o trabalho em blocos independentes; chamado de dentro
+    de uma tarefa, o progresso aparece na barra da tarefa. Dentro de uma tarefa e sem
+    `max_processos`, os lotes rodam em sequência no próprio processo da tarefa, que já é um
+    dos processos do gerenciador (um pool por tarefa chegaria a nº de CPUs² processos).
+
+    Args:
+    - funcao (callable): Função no nível de um módulo.
+    - lotes (list[tuple]): Argumentos de cada chamada.
+    - max_processos (int | None): Nº de processos; padrão é o nº de CPUs (fora de uma tarefa).
+    - rotulo (str): Nome de cada lote na mensagem de progresso.
+
+    Returns:
+    - list: Resultados na ordem dos lotes.
+    """
+    resultados = [None] * len(lotes)
+    if _id_atual is not None and max_processos is None:
+        for i, argumentos in enumerate(lotes):
+            resultados[i] = funcao(*argumentos)
+            informar_progresso((i + 1) / len(lotes), f"{rotulo} {i + 1} de {len(lotes)}")
+        return resultados
+
+    limite = max_processos or os.cpu_count() or 1
+    pendentes = iter(enumerate(lotes))
+    em_execucao = {}
+    concluidos = 0
+    contexto = multiprocessing.get_context("spawn")
+    executor = ProcessPoolExecutor(max_workers=limite, mp_context=contexto)
+    try:
+        while True:
+            # Só `limite` lotes vão para o pool por vez: cancelada a tarefa, os demais nem são enviados.
+            while len(em_execucao) < limite and (proximo := next(pendentes, None)) is not None:
+                i, argumentos = proximo
+                em_execucao[executor.submit(funcao, *argumentos)] = i
+            if not em_execucao:
+                break
+            prontos, _ = wait(em_execucao, timeout=INTERVALO_CANCELAMENTO_S, return_when=FIRST_COMPLETED)
+            verificar_cancelamento()
+            for futuro in prontos:
+                resultados[em_execucao.pop(futuro)] = futuro.result()
+                concluidos += 1
+                informar_progresso(concluidos / len(lotes), f"{rotulo} {concluidos} de {len(lotes)}")
+    finally:
+        # Em caso de cancelamento ou erro, espera apenas os lotes que já estão rodando.
+        executor.shutdown(wait=True, cancel_futures=True)
+    return resultados
+
+
+# --- LADO DO SERVIDOR (STREAMLIT) ---
+class GerenciadorTarefas:
+    """
+    Pool de processos com IDs de tarefa, progresso, cancelamento e resultados.
+
+    Args:
+    - max_processos (int | None): Nº máximo de processos; padrão é o nº de CPUs.
+    """
+
+    def __init__(self, max_processos=None):
+        self.max_processos = max_processos or os.cpu_count() or 1
+        self._trava = threading.Lock()
+        self._futuros = {}
+        self._executor = None
+        self._gerente = None
+
+    def _iniciar(self):
+        # "spawn" evita herdar threads e travas do servidor do Streamlit via fork.
+        if self._executor is None:
+            contexto = multiprocessing.get_context("spawn")
+            self._gerente = contexto.Manager()
+            self._progresso = self._gerente.dict()
+            self._cancelados = self._gerente.dict()
+            self._executor = ProcessPoolExecutor(max_workers=self.max_processos, mp_context=contexto)
+
+    def _reiniciar(self):
+        # Um processo que morre (ex.: OOM killer) quebra o pool inteiro; as tarefas que estavam
+        # nele terminam com erro e as próximas vão para um pool novo.
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._gerente.shutdown()
+        self._executor = self._gerente = None
+        self._iniciar()
+
+    def submeter(self, funcao, *args, **kwargs):
+        """
+        Agenda `funcao(*args, **kwargs)` no pool. A função deve estar definida no
+        nível de um módulo (para poder ser enviada ao outro processo).
+
+        Returns:
+        - str: ID da tarefa.
+        """
+        with self._trava:
+            self._iniciar()
+            id_tarefa = uuid.uuid4().hex
+            try:
+                futuro = self._executor.submit(_executar, id_tarefa, self._progresso, self._cancelados, funcao, args, kwargs)
+            except BrokenProcessPool:
+                self._reiniciar()
+                futuro = self._executor.submit(_executar, id_tarefa, self._progresso, self._cancelados, funcao, args, kwargs)
+            self._futuros[id_tarefa] = futuro
+            self._limitar_historico()
+        return id_tarefa
+
+    def _limitar_historico(self):
+        # Descarta as tarefas finalizadas mais antigas (dicts preservam a ordem de inserção).
+        excesso = len(self._futuros) - MAX_TAREFAS_GUARDADAS
+        for id_tarefa in [i for i, f in self._futuros.items() if f.done()][:max(excesso, 0)]:
+            self._descartar(id_tarefa)
+
+    def _descartar(self, id_tarefa):
+        self._futuros.pop(id_tarefa, None)
+        self._progresso.pop(id_tarefa, None)
+        self._cancelados.pop(id_tarefa, None)
+
+    def _futuro(self, id_tarefa):
+        try:
+            return self._futuros[id_tarefa]
+        except KeyError:
+            raise KeyError(f"Tarefa desconhecida: {id_tarefa!r}") from None
+
+    def estado(self, id_tarefa):
+        futuro = self._futuro(id_tarefa)
+        progresso, mensagem = self._progresso.get(id_tarefa, (0.0, ""))
+        if futuro.cancelled():
+            return EstadoTarefa(id_tarefa, CANCELADA, progresso, mensagem)
+        if not futuro.done():
+            status = EXECUTANDO if id_tarefa in self._progresso else PENDENTE
+            return EstadoTarefa(id_tarefa, status, progresso, mensagem)
+        excecao = futuro.exception()
+        if isinstance(excecao, TarefaCancelada):
+            return EstadoTarefa(id_tarefa, CANCELADA, progresso, mensagem)
+        if excecao is not None:
+            return EstadoTarefa(id_tarefa, ERRO, progresso, mensagem, erro=f"{type(excecao).__name__}: {excecao}")
+        return EstadoTarefa(id_tarefa, CONCLUIDA, 1.0, mensagem)
+
+    def cancelar(self, id_tarefa):
+        """
+        Cancela a tarefa. Se ainda não começou, ela nem chega a rodar; se já está
+        rodando, é interrompida na próxima chamada de `informar_progresso`.
+        """
+        futuro = self._futuro(id_tarefa)
+        if not futuro.cancel() and not futuro.done():
+            self._cancelados[id_tarefa] = True
+
+    def resultado(self, id_tarefa, timeout=None):
+        """
+        Aguarda e devolve o resultado. Levanta `TarefaCancelada` se a tarefa foi
+        cancelada ou a exceção original se ela falhou.
+        """
+        try:
+            return self._futuro(id_tarefa).result(timeout=timeout)
+        except CancelledError:
+            raise TarefaCancelada(id_tarefa) from None
+
+    def descartar(self, id_tarefa):
+        """Esquece uma tarefa finalizada (libera o resultado da memória)."""
+        with self._trava:
+            self._descartar(id_tarefa)
+
+    def encerrar(self, cancelar_pendentes=True):
+        with self._trava:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=cancelar_pendentes)
+                self._gerente.shutdown()
+                self._executor = self._gerente = None
+            self._futuros.clear()
+
+
+_gerenciador = None
+_trava_gerenciador = threading.Lock()
+
+
+def gerenciador_padrao():
+    """Gerenciador único do processo, compartilhado por todas as sessões."""
+    global _gerenciador
+    with _trava_gerenciador:
+        if _gerenciador is None:
+            _gerenciador = GerenciadorTarefas()
+        return _gerenciador
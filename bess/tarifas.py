@@ -0,0 +1,167 @@
+"""
+Faturamento de energia com as modalidades tarifárias horárias brasileiras (Verde e Azul).
+
+Aplica as tarifas de energia por posto horário (ponta e fora de ponta) e a cobrança
+mensal de demanda a séries de potência, antes e depois do BESS, para calcular a
+economia mês a mês. O cálculo é um único `groupby` por (mês, posto) sobre todas as
+colunas, então séries de vários anos em 15 min para muitos consumidores são faturadas
+de uma vez.
+
+- **Verde:** Uma tarifa de demanda (R$/kW) sobre a maior demanda do mês, em qualquer
+  horário, e tarifas de energia diferentes na ponta e fora de ponta.
+- **Azul:** Tarifas de demanda separadas para a ponta e a fora de ponta, além das
+  tarifas de energia por posto.
+
+Impostos (ICMS, PIS/COFINS), bandeiras e reativos não são considerados.
+"""
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from numpy.typing import ArrayLike
+
+
+VERDE = "verde"
+AZUL = "azul"
+
+# Acima de 5% da demanda contratada, o excedente é cobrado em dobro (ultrapassagem).
+TOLERANCIA_ULTRAPASSAGEM = 1.05
+FATOR_ULTRAPASSAGEM = 2.0
+
+COLUNAS_FATURA = [
+    'Energia Ponta (kWh)', 'Energia Fora Ponta (kWh)', 'Demanda Ponta (kW)', 'Demanda Fora Ponta (kW)',
+    'Custo Energia (R$)', 'Custo Demanda (R$)', 'Ultrapassagem (R$)', 'Total (R$)',
+]
+
+
+@dataclass(frozen=True, slots=True)
+class Tarifa:
+    """
+    Estrutura tarifária horária (valores em R$/kWh e R$/kW, sem impostos).
+
+    O horário de ponta vale apenas em dias úteis, de `inicio_ponta` até `fim_ponta` (exclusivo).
+    Na modalidade Verde, usa-se `demanda` e `demanda_contratada`; na Azul, os campos por posto.
+    """
+    modalidade: str
+    energia_ponta: float
+    energia_fora_ponta: float
+    demanda: float = 0.0
+    demanda_ponta: float = 0.0
+    demanda_fora_ponta: float = 0.0
+    demanda_contratada: float = 0.0
+    demanda_contratada_ponta: float = 0.0
+    demanda_contratada_fora_ponta: float = 0.0
+    inicio_ponta: int = 18
+    fim_ponta: int = 21
+
+    def __post_init__(self):
+        if self.modalidade not in (VERDE, AZUL):
+            raise ValueError(f"Modalidade tarifária desconhecida: {self.modalidade!r} (use {VERDE!r} ou {AZUL!r})")
+
+
+# Valores ilustrativos, da ordem de grandeza das tarifas A4 das distribuidoras brasileiras.
+TARIFAS_EXEMPLO = {
+    VERDE: Tarifa(VERDE, energia_ponta=2.10, energia_fora_ponta=0.45, demanda=35.0),
+    AZUL: Tarifa(AZUL, energia_ponta=0.65, energia_fora_ponta=0.45, demanda_ponta=95.0, demanda_fora_ponta=35.0),
+}
+
+
+def horario_ponta(indice: ArrayLike, tarifa: Tarifa, feriados: Iterable = ()) -> np.ndarray:
+    """Máscara booleana com as amostras do horário de ponta (dias úteis, exceto feriados)."""
+    indice = pd.DatetimeIndex(indice)
+    dia_util = (indice.dayofweek < 5) & ~indice.normalize().isin(pd.DatetimeIndex(feriados))
+    return np.asarray(dia_util & (indice.hour >= tarifa.inicio_ponta) & (indice.hour < tarifa.fim_ponta))
+
+
+def repetir_perfil_diario(perfil: ArrayLike, inicio: str | pd.Timestamp = "2025-01-01", dias: int = 365) -> pd.Series:
+    """
+    Série horária que repete um perfil de 24 valores por vários dias.
+
+    Returns:
+    - pandas.Series: Série com índice horário (DatetimeIndex).
+    """
+    perfil = np.asarray(perfil, dtype=float)
+    indice = pd.date_range(inicio, periods=len(perfil) * dias, freq=pd.Timedelta(hours=24 / len(perfil)))
+    return pd.Series(np.tile(perfil, dias), index=indice)
+
+
+def _demanda_faturada(medida, contratada, tarifa_demanda):
+    # Cobra-se o maior valor entre medida e contratada; o excesso acima da tolerância paga ultrapassagem.
+    faturada = np.maximum(medida, contratada)
+    excedente = np.where((contratada > 0) & (medida > TOLERANCIA_ULTRAPASSAGEM * contratada), medida - contratada, 0.0)
+    return faturada * tarifa_demanda, excedente * tarifa_demanda * FATOR_ULTRAPASSAGEM
+
+
+def faturar(potencia_kw: pd.Series | pd.DataFrame, tarifa: Tarifa, feriados: Iterable = ()) -> pd.DataFrame:
+    """
+    Fatura mensal de um ou mais consumidores.
+
+    Args:
+    - potencia_kw (pandas.Series | pandas.DataFrame): Potência consumida da rede (kW) com
+      índice de datas regular, em geral de 15 min (o intervalo de integração da demanda).
+      Em um DataFrame, cada coluna é um consumidor.
+    - tarifa (Tarifa): Estrutura tarifária.
+    - feriados (list): Datas sem horário de ponta.
+
+    Returns:
+    - pandas.DataFrame: Índice (Mês, Consumidor) e as colunas de `COLUNAS_FATURA`.
+    """
+    if isinstance(potencia_kw, pd.Series):
+        potencia_kw = potencia_kw.to_frame(potencia_kw.name if potencia_kw.name is not None else "consumidor")
+    # Energia injetada na rede não é creditada aqui: só o consumo entra na fatura.
+    tabela = potencia_kw.clip(lower=0)
+    indice = pd.DatetimeIndex(tabela.index)
+    passo_h = pd.Series(indice).diff().median() / pd.Timedelta(hours=1) if len(indice) > 1 else 1.0
+
+    ponta = horario_ponta(indice, tarifa, feriados)
+    meses = indice.to_period("M")
+    # Um único groupby por (mês, posto) para todos os consumidores.
+    grupos = tabela.groupby([meses, ponta])
+    energia = grupos.sum() * passo_h
+    demanda = grupos.max()
+
+    todos_meses = meses.unique()
+    def por_posto(valores, posto):
+        if posto not in valores.index.get_level_values(1):
+            return np.zeros((len(todos_meses), tabela.shape[1]))
+        return valores.xs(posto, level=1).reindex(todos_meses, fill_value=0.0).to_numpy()
+
+    energia_p, energia_fp = por_posto(energia, True), por_posto(energia, False)
+    demanda_p, demanda_fp = por_posto(demanda, True), por_posto(demanda, False)
+
+    custo_energia = energia_p * tarifa.energia_ponta + energia_fp * tarifa.energia_fora_ponta
+    if tarifa.modalidade == VERDE:
+        custo_demanda, ultrapassagem = _demanda_faturada(np.maximum(demanda_p, demanda_fp), tarifa.demanda_contratada, tarifa.demanda)
+    else:
+        custo_p, ultrapassagem_p = _demanda_faturada(demanda_p, tarifa.demanda_contratada_ponta, tarifa.demanda_ponta)
+        custo_fp, ultrapassagem_fp = _demanda_faturada(demanda_fp, tarifa.demanda_contratada_fora_ponta, tarifa.demanda_fora_ponta)
+        custo_demanda, ultrapassagem = custo_p + custo_fp, ultrapassagem_p + ultrapassagem_fp
+
+    valores = [energia_p, energia_fp, demanda_p, demanda_fp, custo_energia, custo_demanda, ultrapassagem,
+               custo_energia + custo_demanda + ultrapassagem]
+    linhas = pd.MultiIndex.from_product([todos_meses, tabela.columns], names=['Mês', 'Consumidor'])
+    return pd.DataFrame({coluna: v.ravel() for coluna, v in zip(COLUNAS_FATURA, valores)}, index=linhas)
+
+
+def economia_mensal(antes_kw: pd.Series | pd.DataFrame, depois_kw: pd.Series | pd.DataFrame, tarifa: Tarifa,
+                    feriados: Iterable = ()) -> pd.DataFrame:
+    """
+    Economia mensal na fatura proporcionada pelo BESS.
+
+    Args:
+    - antes_kw, depois_kw (pandas.Series | pandas.DataFrame): Potência da rede sem e com o BESS (kW).
+    - tarifa (Tarifa): Estrutura tarifária.
+    - feriados (list): Datas sem horário de ponta.
+
+    Returns:
+    - pandas.DataFrame: Índice (Mês, Consumidor) e as colunas 'Fatura sem BESS (R$)',
+      'Fatura com BESS (R$)' e 'Economia (R$)'.
+    """
+    antes = faturar(antes_kw, tarifa, feriados)['Total (R$)']
+    depois = faturar(depois_kw, tarifa, feriados)['Total (R$)']
+    return pd.DataFrame({
+        'Fatura sem BESS (R$)': antes,
+        'Fatura com BESS (R$)': depois,
+        'Economia (R$)': antes - depois,
+    })
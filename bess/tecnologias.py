@@ -0,0 +1,170 @@
+"""
+Modelo comparativo das tecnologias de armazenamento da página de introdução.
+
+Cada tecnologia (UHER, CAES, volantes, bateria gravitacional, baterias, hidrogênio) é
+descrita por poucos parâmetros: eficiência de ida e volta, autodescarga, limite de
+rampa, faixa de duração (desacoplamento energia/potência) e custos. O mesmo perfil de
+despacho é aplicado a todas as variantes (tecnologia x potência x duração) de uma vez,
+com o laço no tempo e cada passo vetorizado sobre as variantes, e o resultado é
+comparado pelo LCOS (custo nivelado do armazenamento).
+
+Os parâmetros são indicativos, da ordem de grandeza da literatura, e servem para
+comparar as tecnologias entre si, não para orçar projetos.
+"""
+from dataclasses import astuple, dataclass, fields
+
+import numpy as np
+import pandas as pd
+
+from .cache_resultados import resultado_cacheado
+
+
+@dataclass(frozen=True, slots=True)
+class Tecnologia:
+    """Parâmetros de uma tecnologia de armazenamento (custos em US$)."""
+    eficiencia: float            # Eficiência de ida e volta
+    autodescarga_dia: float      # Fração da energia armazenada perdida por dia
+    rampa_pu_min: float          # Variação máxima de potência, em pu da nominal por minuto
+    custo_potencia: float        # US$/kW
+    custo_energia: float         # US$/kWh
+    opex_anual: float            # Fração do CAPEX por ano
+    vida_anos: float
+    vida_ciclos: float
+    duracao_min_h: float         # Faixa de duração viável (energia / potência)
+    duracao_max_h: float
+
+
+TECNOLOGIAS = {
+    "UHER": Tecnologia(0.80, 0.0, 0.3, 1500, 60, 0.015, 50, 30000, 4, 24),
+    "CAES Diabático": Tecnologia(0.50, 0.005, 0.1, 1100, 40, 0.020, 30, 15000, 4, 24),
+    "CAES Adiabático": Tecnologia(0.70, 0.005, 0.1, 1300, 60, 0.020, 30, 15000, 4, 24),
+    "Volante de Inércia": Tecnologia(0.85, 0.5, 100.0, 600, 4000, 0.020, 20, 200000, 0.05, 1),
+    "Bateria Gravitacional": Tecnologia(0.82, 0.0, 1.0, 1200, 300, 0.015, 35, 50000, 2, 12),
+    "Chumbo-Ácido": Tecnologia(0.75, 0.003, 100.0, 300, 280, 0.020, 10, 2500, 1, 8),
+    "Íon-Lítio (LFP)": Tecnologia(0.88, 0.001, 100.0, 250, 280, 0.025, 15, 6000, 0.5, 8),
+    "Bateria de Fluxo": Tecnologia(0.70, 0.001, 100.0, 900, 350, 0.025, 20, 15000, 2, 12),
+    "Hidrogênio": Tecnologia(0.35, 0.0, 0.2, 2500, 15, 0.020, 20, 40000, 12, 720),
+}
+
+CAMPOS = [campo.name for campo in fields(Tecnologia)]
+
+
+def perfil_arbitragem(potencia_mw=100, dias=7, horas_carga=(1, 6), horas_descarga=(17, 21)):
+    """
+    Perfil horário de arbitragem diária: carrega na madrugada e descarrega no pico.
+
+    Returns:
+    - numpy.ndarray: Potência pedida ao armazenamento (MW), positiva descarregando.
+    """
+    horas = np.arange(24 * dias) % 24
+    carga = (horas >= horas_carga[0]) & (horas < horas_carga[1])
+    descarga = (horas >= horas_descarga[0]) & (horas < horas_descarga[1])
+    return potencia_mw * (descarga.astype(float) - carga.astype(float))
+
+
+def variantes(potencias_mw, duracoes_h, tecnologias=None):
+    """
+    Todas as combinações tecnologia x potência x duração dentro da faixa viável de cada tecnologia.
+
+    Returns:
+    - pandas.DataFrame: Uma linha por variante, com 'Tecnologia', 'Potência (MW)',
+      'Duração (h)', 'Energia (MWh)' e os parâmetros da tecnologia.
+    """
+    nomes = list(TECNOLOGIAS) if tecnologias is None else list(tecnologias)
+    linhas = [
+        (nome, float(p), float(d), *astuple(TECNOLOGIAS[nome]))
+        for nome in nomes for p in potencias_mw for d in duracoes_h
+        if TECNOLOGIAS[nome].duracao_min_h <= d <= TECNOLOGIAS[nome].duracao_max_h
+    ]
+    tabela = pd.DataFrame(linhas, columns=['Tecnologia', 'Potência (MW)', 'Duração (h)', *CAMPOS])
+    tabela.insert(3, 'Energia (MWh)', tabela['Potência (MW)'] * tabela['Duração (h)'])
+    return tabela
+
+
+def despachar_variantes(perfil_mw, potencia_mw, energia_mwh, eficiencia, autodescarga_dia, rampa_pu_min,
+                        passo_h=1.0, soc_inicial=0.5):
+    """
+    Aplica o mesmo perfil de despacho a V variantes de uma vez.
+
+    Args:
+    - perfil_mw (array): Potência pedida (T,), positiva descarregando (MW).
+    - potencia_mw, energia_mwh, eficiencia, autodescarga_dia, rampa_pu_min (array): Parâmetros (V,).
+    - passo_h (float): Duração de cada passo em horas.
+    - soc_inicial (float): Estado de carga inicial.
+
+    Returns:
+    - tuple[numpy.ndarray, numpy.ndarray]: Potência entregue (V, T), positiva descarregando,
+      e SoC (V, T).
+    """
+    perfil_mw = np.asarray(perfil_mw, dtype=float)
+    eta = np.sqrt(np.asarray(eficiencia, dtype=float))
+    potencia = np.asarray(potencia_mw, dtype=float)
+    energia_max = np.asarray(energia_mwh, dtype=float)
+    retencao = (1.0 - np.asarray(autodescarga_dia, dtype=float)) ** (passo_h / 24)
+    # Variação máxima entre dois passos (MW).
+    rampa = np.asarray(rampa_pu_min, dtype=float) * potencia * 60 * passo_h
+
+    energia = soc_inicial * energia_max
+    anterior = np.zeros_like(potencia)
+    entregue = np.empty((len(perfil_mw), len(potencia)))
+    soc = np.empty_like(entregue)
+    for t, pedido in enumerate(perfil_mw):
+        p = np.clip(pedido, -potencia, potencia)
+        p = np.clip(p, anterior - rampa, anterior + rampa)
+        # Limites de energia: não descarrega abaixo de vazio nem carrega acima de cheio.
+        p = np.minimum(p, energia * eta / passo_h)
+        p = np.maximum(p, -(energia_max - energia) / (eta * passo_h))
+        energia = (energia - np.where(p > 0, p / eta, p * eta) * passo_h) * retencao
+        anterior = p
+        entregue[t] = p
+        soc[t] = energia / energia_max
+    return entregue.T, soc.T
+
+
+def _fator_recuperacao(taxa, anos):
+    return taxa * (1 + taxa) ** anos / ((1 + taxa) ** anos - 1)
+
+
+@resultado_cacheado(versao="1")
+def comparar(perfil_mw, potencias_mw, duracoes_h, tecnologias=None, passo_h=1.0, taxa_desconto=0.08,
+             preco_carga=40.0):
+    """
+    Compara as variantes pelo LCOS, aplicando o mesmo perfil de despacho a todas.
+
+    Args:
+    - perfil_mw (array): Potência pedida ao armazenamento (MW), positiva descarregando.
+    - potencias_mw, duracoes_h (list): Tamanhos avaliados.
+    - tecnologias (list[str] | None): Tecnologias de `TECNOLOGIAS`; padrão é todas.
+    - passo_h (float): Duração de cada passo do perfil em horas.
+    - taxa_desconto (float): Taxa de desconto anual.
+    - preco_carga (float): Preço da energia usada na carga (US$/MWh).
+
+    Returns:
+    - pandas.DataFrame: As variantes com 'Atendimento (%)', 'Ciclos/ano', 'Vida Efetiva (anos)',
+      'CAPEX (US$ mi)' e 'LCOS (US$/MWh)'.
+    """
+    tabela = variantes(potencias_mw, duracoes_h, tecnologias)
+    perfil_mw = np.asarray(perfil_mw, dtype=float)
+    entregue, _ = despachar_variantes(
+        perfil_mw, *(tabela[c].to_numpy() for c in ['Potência (MW)', 'Energia (MWh)', 'eficiencia', 'autodescarga_dia', 'rampa_pu_min']),
+        passo_h=passo_h,
+    )
+
+    # Tudo é anualizado a partir do horizonte simulado.
+    anualizar = 8760 / (len(perfil_mw) * passo_h)
+    descarregada = np.clip(entregue, 0, None).sum(axis=1) * passo_h * anualizar
+    carregada = -np.clip(entregue, None, 0).sum(axis=1) * passo_h * anualizar
+    pedida = np.clip(perfil_mw, 0, None).sum() * passo_h * anualizar
+
+    ciclos = descarregada / tabela['Energia (MWh)'].to_numpy()
+    vida = np.minimum(tabela['vida_anos'].to_numpy(), tabela['vida_ciclos'].to_numpy() / np.maximum(ciclos, 1e-9))
+    capex = (tabela['Potência (MW)'] * tabela['custo_potencia'] + tabela['Energia (MWh)'] * tabela['custo_energia']).to_numpy() * 1e3
+    custo_anual = capex * _fator_recuperacao(taxa_desconto, vida) + capex * tabela['opex_anual'].to_numpy() + carregada * preco_carga
+
+    tabela['Atendimento (%)'] = 100 * descarregada / pedida if pedida > 0 else np.nan
+    tabela['Energia Entregue (MWh/ano)'] = descarregada
+    tabela['Ciclos/ano'] = ciclos
+    tabela['Vida Efetiva (anos)'] = vida
+    tabela['CAPEX (US$ mi)'] = capex / 1e6
+    tabela['LCOS (US$/MWh)'] = np.where(descarregada > 0, custo_anual / np.maximum(descarregada, 1e-9), np.nan)
+    return tabela
@@ -0,0 +1,200 @@
+"""
+Agregação da telemetria de uma frota de BESS na hierarquia Célula > Módulo > Rack > Contêiner.
+
+A telemetria fica em estrutura de arrays (SoA): um array por grandeza (tensão,
+temperatura, SoC) com uma posição por célula, e as células ordenadas pela hierarquia,
+de modo que cada módulo, rack e contêiner ocupa um trecho contíguo. Os resumos por
+nível (mín./máx./média e dispersão) são então reduções segmentadas (`reduceat`): as
+células são reduzidas a módulos, os módulos a racks e os racks a contêineres, sem
+nenhum laço em Python por objeto. Uma frota de ~100 mil células é agregada em poucos
+milissegundos, dentro da cadência de 1 Hz da telemetria.
+"""
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+NIVEIS = ("modulo", "rack", "container")
+GRANDEZAS = ("tensao", "temperatura", "soc")
+ROTULOS_NIVEIS = {"modulo": ['Contêiner', 'Rack', 'Módulo'], "rack": ['Contêiner', 'Rack'], "container": ['Contêiner']}
+
+COLUNAS_AGREGADAS = [
+    'Células',
+    'Tensão Mín (V)', 'Tensão Máx (V)', 'Tensão Média (V)',
+    'Temperatura Mín (°C)', 'Temperatura Máx (°C)', 'Temperatura Média (°C)',
+    'SoC Mín', 'SoC Máx', 'SoC Médio',
+    'Desvio de Tensão (V)', 'Dispersão de SoC',
+]
+
+
+@dataclass(frozen=True, eq=False, slots=True)
+class Topologia:
+    """
+    Posição de cada célula na hierarquia, já ordenada para as reduções segmentadas.
+
+    - ordem: Permutação que leva a ordem original das células à ordem da hierarquia.
+    - posicao: Inversa de `ordem` (posição de cada célula original no armazenamento).
+    - inicios: Para cada nível, onde começa cada grupo no nível imediatamente abaixo
+      (módulos em células, racks em módulos, contêineres em racks).
+    - rotulos: Para cada nível, os identificadores originais de cada grupo.
+    """
+    ordem: np.ndarray
+    posicao: np.ndarray
+    inicios: dict
+    rotulos: dict
+
+    @property
+    def n_celulas(self):
+        return len(self.ordem)
+
+    @classmethod
+    def de_ids(cls, container, rack, modulo):
+        """
+        Monta a topologia a partir dos identificadores de cada célula, em qualquer ordem.
+
+        Args:
+        - container, rack, modulo (array): Identificadores (C,) de cada célula. O módulo só
+          precisa ser único dentro do rack, e o rack dentro do contêiner.
+
+        Returns:
+        - Topologia: Topologia com uma posição por célula.
+        """
+        ids = [np.asarray(x) for x in (container, rack, modulo)]
+        ordem = np.lexsort(ids[::-1])
+        c, r, m = (x[ordem] for x in ids)
+        posicao = np.empty_like(ordem)
+        posicao[ordem] = np.arange(len(ordem))
+
+        def mudou(*colunas):
+            novo = np.ones(len(ordem), dtype=bool)
+            novo[1:] = np.logical_or.reduce([x[1:] != x[:-1] for x in colunas])
+            return novo
+
+        novo_modulo, novo_rack, novo_container = mudou(c, r, m), mudou(c, r), mudou(c)
+        celula_modulo = np.flatnonzero(novo_modulo)
+        modulo_rack = np.flatnonzero(novo_rack[celula_modulo])
+        rack_container = np.flatnonzero(novo_container[celula_modulo][modulo_rack])
+        celula_rack = celula_modulo[modulo_rack]
+        celula_container = celula_rack[rack_container]
+        return cls(
+            ordem=ordem,
+            posicao=posicao,
+            inicios={"modulo": celula_modulo, "rack": modulo_rack, "container": rack_container},
+            rotulos={
+                "modulo": [c[celula_modulo], r[celula_modulo], m[celula_modulo]],
+                "rack": [c[celula_rack], r[celula_rack]],
+                "container": [c[celula_container]],
+            },
+        )
+
+    @classmethod
+    def regular(cls, containers, racks_por_container, modulos_por_rack, celulas_por_modulo):
+        """Frota homogênea, com as células numeradas em ordem (contêiner, rack, módulo, célula)."""
+        c, r, m, _ = np.meshgrid(
+            np.arange(containers), np.arange(racks_por_container), np.arange(modulos_por_rack),
+            np.arange(celulas_por_modulo), indexing="ij",
+        )
+        return cls.de_ids(c.ravel(), r.ravel(), m.ravel())
+
+
+class Telemetria:
+    """
+    Última leitura de cada célula da frota, em estrutura de arrays, com os resumos por nível.
+
+    Os resumos são calculados sob demanda e reaproveitados até a próxima atualização.
+    """
+    __slots__ = ("topologia", "valores", "instante", "_agregados")
+
+    def __init__(self, topologia, dtype=np.float32):
+        self.topologia = topologia
+        # Uma linha por grandeza (GRANDEZAS), uma coluna por célula na ordem da hierarquia.
+        self.valores = np.full((len(GRANDEZAS), topologia.n_celulas), np.nan, dtype=dtype)
+        self.instante = None
+        self._agregados = None
+
+    @property
+    def tensao(self):
+        return self.valores[0]
+
+    @property
+    def temperatura(self):
+        return self.valores[1]
+
+    @property
+    def soc(self):
+        return self.valores[2]
+
+    def atualizar(self, tensao, temperatura, soc, celulas=None, instante=None):
+        """
+        Grava uma leitura da frota inteira ou de parte das células.
+
+        Args:
+        - tensao, temperatura, soc (array): Valores na ordem original das células (C,) ou
+          na ordem de `celulas`.
+        - celulas (array | None): Índices originais das células lidas; padrão é todas.
+        - instante (float | None): Horário da leitura (epoch em s); padrão é agora.
+        """
+        if celulas is None:
+            self.valores[:] = np.stack([tensao, temperatura, soc])[:, self.topologia.ordem]
+        else:
+            self.valores[:, self.topologia.posicao[np.asarray(celulas)]] = np.stack([tensao, temperatura, soc])
+        self.instante = time.time() if instante is None else instante
+        self._agregados = None
+
+    def _calcular(self):
+        # Células que ainda não reportaram (NaN) ficam fora de mínimos, máximos e médias.
+        valido = ~np.isnan(self.valores)
+        minimo = np.where(valido, self.valores, np.inf)
+        maximo = np.where(valido, self.valores, -np.inf)
+        soma = np.where(valido, self.valores, 0.0).astype(np.float64)
+        quadrado = soma * soma
+        contagem = valido.astype(np.int64)
+
+        agregados = {}
+        for nivel in NIVEIS:
+            inicios = self.topologia.inicios[nivel]
+            # Cada nível é reduzido a partir do anterior (células -> módulos -> racks -> contêineres).
+            minimo = np.minimum.reduceat(minimo, inicios, axis=1)
+            maximo = np.maximum.reduceat(maximo, inicios, axis=1)
+            soma = np.add.reduceat(soma, inicios, axis=1)
+            quadrado = np.add.reduceat(quadrado, inicios, axis=1)
+            contagem = np.add.reduceat(contagem, inicios, axis=1)
+            agregados[nivel] = (minimo, maximo, soma, quadrado, contagem)
+        self._agregados = agregados
+
+    def agregar(self, nivel):
+        """
+        Resumo da última leitura por módulo, rack ou contêiner.
+
+        Args:
+        - nivel (str): Um de `NIVEIS`.
+
+        Returns:
+        - dict[str, numpy.ndarray]: Um array por coluna de `COLUNAS_AGREGADAS`, com um
+          valor por grupo do nível.
+        """
+        if nivel not in NIVEIS:
+            raise ValueError(f"Nível desconhecido: {nivel!r} (use um de {NIVEIS})")
+        if self._agregados is None:
+            self._calcular()
+        minimo, maximo, soma, quadrado, contagem = self._agregados[nivel]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            media = soma / contagem
+            desvio_tensao = np.sqrt(np.maximum(quadrado[0] / contagem[0] - media[0] ** 2, 0.0))
+        vazio = contagem == 0
+        minimo = np.where(vazio, np.nan, minimo)
+        maximo = np.where(vazio, np.nan, maximo)
+        return dict(zip(COLUNAS_AGREGADAS, [
+            contagem[0],
+            minimo[0], maximo[0], media[0],
+            minimo[1], maximo[1], media[1],
+            minimo[2], maximo[2], media[2],
+            desvio_tensao, maximo[2] - minimo[2],
+        ]))
+
+    def tabela(self, nivel):
+        """Resumo de `agregar` como DataFrame, indexado pelos identificadores do nível."""
+        indice = pd.MultiIndex.from_arrays(self.topologia.rotulos[nivel], names=ROTULOS_NIVEIS[nivel])
+        return pd.DataFrame(self.agregar(nivel), index=indice)
@@ -0,0 +1,92 @@
+"""
+Varredura de parâmetros (análise de sensibilidade) para o dimensionamento do BESS.
+
+Avalia uma grade de combinações (potência, capacidade, eficiência, limiar) usando o
+despacho vetorizado de `simulacao.despachar`, que calcula todas as combinações de uma
+vez ao longo do eixo de parâmetros. Quando a grade inteira não cabe no orçamento de
+memória, ela é dividida em blocos avaliados em paralelo por um pool de processos.
+"""
+import numpy as np
+import pandas as pd
+
+from . import simulacao, tarefas
+from .cache_resultados import resultado_cacheado
+
+
+MEMORIA_MAX_BYTES = 256 * 1024 * 1024
+# Arrays (P, T) de float64 por bloco: os de `despachar` e a cópia de `np.clip` em `_avaliar_bloco`.
+ARRAYS_POR_PONTO = simulacao.ARRAYS_DESPACHAR + 1
+
+COLUNAS_PARAMETROS = ['Potência (MW)', 'Energia (MWh)', 'Eficiência', 'Limiar (MW)']
+
+
+def grade_parametros(potencias, energias, eficiencias, limiares):
+    """Todas as combinações dos valores informados (produto cartesiano), como DataFrame."""
+    eixos = np.meshgrid(potencias, energias, eficiencias, limiares, indexing="ij")
+    return pd.DataFrame({nome: eixo.ravel().astype(float) for nome, eixo in zip(COLUNAS_PARAMETROS, eixos)})
+
+
+def _avaliar_bloco(demanda, potencia, energia, eficiencia, limiar, passo_h):
+    rede, bess, _ = simulacao.despachar(demanda, potencia, energia, eficiencia, limiar, passo_h=passo_h)
+    return rede.max(axis=1), np.clip(bess, 0.0, None).sum(axis=1) * passo_h
+
+
+def fronteira_pareto(custo, reducao):
+    """
+    Marca os pontos não dominados: nenhum outro ponto tem custo menor ou igual
+    com redução de pico maior.
+
+    Returns:
+    - numpy.ndarray: Máscara booleana com os pontos da fronteira.
+    """
+    ordem = np.lexsort((-reducao, custo))
+    reducao_ordenada = reducao[ordem]
+    melhor_anterior = np.concatenate([[-np.inf], np.maximum.accumulate(reducao_ordenada)[:-1]])
+    mascara = np.zeros(len(custo), dtype=bool)
+    mascara[ordem] = reducao_ordenada > melhor_anterior
+    return mascara
+
+
+@resultado_cacheado(versao="1")
+def varrer(demanda, potencias, energias, eficiencias, limiares, custo_potencia=1.2, custo_energia=1.5,
+           passo_h=1.0, memoria_max_bytes=MEMORIA_MAX_BYTES, max_processos=None):
+    """
+    Avalia todas as combinações de parâmetros e resume custo vs. redução de pico.
+
+    Args:
+    - demanda (array): Perfil de demanda (MW).
+    - potencias, energias, eficiencias, limiares (array): Valores de cada eixo da grade.
+    - custo_potencia (float): CAPEX por MW (R$ milhões/MW).
+    - custo_energia (float): CAPEX por MWh (R$ milhões/MWh).
+    - passo_h (float): Duração de cada amostra em horas.
+    - memoria_max_bytes (int): Orçamento de memória por bloco avaliado.
+    - max_processos (int | None): Processos usados quando a grade é dividida em blocos.
+
+    Returns:
+    - pandas.DataFrame: Uma linha por combinação, com os parâmetros, 'Pico da Rede (MW)',
+      'Redução de Pico (MW)', 'Energia Descarregada (MWh)', 'Custo (R$ mi)' e 'Pareto'.
+    """
+    demanda = np.asarray(demanda, dtype=float)
+    grade = grade_parametros(potencias, energias, eficiencias, limiares)
+    parametros = [grade[c].to_numpy() for c in COLUNAS_PARAMETROS]
+    n_pontos = len(grade)
+
+    tamanho_bloco = max(1, int(memoria_max_bytes // (len(demanda) * 8 * ARRAYS_POR_PONTO)))
+    if n_pontos <= tamanho_bloco:
+        pico, descarregada = _avaliar_bloco(demanda, *parametros, passo_h)
+    else:
+        # A grade não cabe de uma vez: blocos independentes em um pool de processos.
+        blocos = [
+            (demanda, *(p[i:i + tamanho_bloco] for p in parametros), passo_h)
+            for i in range(0, n_pontos, tamanho_bloco)
+        ]
+        resultados = tarefas.mapear_lotes(_avaliar_bloco, blocos, max_processos, rotulo="Bloco")
+        pico = np.concatenate([r[0] for r in resultados])
+        descarregada = np.concatenate([r[1] for r in resultados])
+
+    grade['Pico da Rede (MW)'] = pico
+    grade['Redução de Pico (MW)'] = demanda.max() - pico
+    grade['Energia Descarregada (MWh)'] = descarregada
+    grade['Custo (R$ mi)'] = grade['Potência (MW)'] * custo_potencia + grade['Energia (MWh)'] * custo_energia
+    grade['Pareto'] = fronteira_pareto(grade['Custo (R$ mi)'].to_numpy(), grade['Redução de Pico (MW)'].to_numpy())
+    return grade
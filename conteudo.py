@@ -0,0 +1,49 @@
+"""
+Registro do conteúdo estático das páginas (tabelas), carregado uma vez por processo.
+
+As tabelas ficam em `conteudo.json` e são convertidas uma única vez em tabelas Arrow
+imutáveis, compartilhadas por todas as sessões. O `st.dataframe` recebe a tabela Arrow
+diretamente, então o pandas não é usado a cada execução das páginas de texto.
+"""
+import json
+import os
+from functools import lru_cache
+from types import MappingProxyType
+
+import pyarrow as pa
+
+
+CAMINHO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "conteudo.json")
+
+
+def _montar_tabela(colunas):
+    # Colunas de tamanhos diferentes são completadas com texto vazio (células em branco).
+    n_linhas = max((len(valores) for valores in colunas.values()), default=0)
+    return pa.table({
+        nome: pa.array(list(valores) + [""] * (n_linhas - len(valores)), type=pa.string())
+        for nome, valores in colunas.items()
+    })
+
+
+@lru_cache(maxsize=None)
+def _registro(caminho=CAMINHO):
+    with open(caminho, encoding="utf-8") as arquivo:
+        bruto = json.load(arquivo)
+    tabelas = {nome: _montar_tabela(colunas) for nome, colunas in bruto.get("tabelas", {}).items()}
+    return MappingProxyType(tabelas)
+
+
+def tabela(nome):
+    """
+    Tabela estática registrada em `conteudo.json`.
+
+    Args:
+    - nome (str): Identificador da tabela (ex.: "bms.balanceamento_passivo").
+
+    Returns:
+    - pyarrow.Table: Tabela imutável, pronta para `st.dataframe`.
+    """
+    try:
+        return _registro()[nome]
+    except KeyError:
+        raise KeyError(f"Tabela não registrada em conteudo.json: {nome!r}") from None
@@ -0,0 +1,438 @@
+"""
+Exportação do app para um site estático (HTML), servido de qualquer servidor de arquivos ou CDN.
+
+Uso (a partir da raiz do repositório):
+
+    python exportar.py                                   # gera o site em ./site
+    python exportar.py --saida publico --url-app https://bess.exemplo.com.br
+
+Cada página do menu (`arquivos.PAGINAS`) é executada uma vez com um gravador no lugar
+do módulo `streamlit`: os textos viram Markdown renderizado no navegador (marked +
+KaTeX), os gráficos são gravados como JSON do Plotly já calculado e as imagens são
+reduzidas ao tamanho exibido e convertidas para WebP. Os controles (sliders, caixas de
+seleção) assumem o valor padrão, então os gráficos mostram o cenário inicial de cada
+seção. As simulações que dependem de uma sessão ao vivo (`arquivos.INTERATIVAS`) viram
+um link para o app.
+"""
+import argparse
+import html
+import os
+import textwrap
+import unicodedata
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+from PIL import Image
+from plotly.offline import get_plotlyjs_version
+
+import arquivos
+
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+URL_APP = os.environ.get("BESS_APP_URL", "http://localhost:8501")
+AUTOR = "Marcus Vinícius"
+
+# Imagens com até 2x a largura exibida (telas de alta densidade), em WebP.
+ESCALA_IMAGEM = 2
+QUALIDADE_WEBP = 80
+LINHAS_MAX_TABELA = 1000
+
+CDN = {
+    "plotly": f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js",
+    "marked": "https://cdn.jsdelivr.net/npm/marked@12/marked.min.js",
+    "katex_css": "https://cdn.jsdelivr.net/npm/katex@0.16/dist/katex.min.css",
+    "katex": "https://cdn.jsdelivr.net/npm/katex@0.16/dist/katex.min.js",
+}
+
+
+def _md(texto, inline=False):
+    # O Streamlit remove a indentação comum dos blocos de texto; aqui, o navegador renderiza o Markdown.
+    texto = html.escape(textwrap.dedent(str(texto)).strip())
+    return f'<span class="md-inline">{texto}</span>' if inline else f'<div class="md">{texto}</div>'
+
+
+class _Bloco:
+    """Contêiner de elementos (página, coluna, aba, expander), com a API do Streamlit usada em `arquivos.py`."""
+
+    def __init__(self, gravador, abrir="", fechar=""):
+        self._gravador = gravador
+        self._abrir = abrir
+        self._fechar = fechar
+        self._filhos = []
+
+    def _destino(self):
+        return self
+
+    def _adicionar(self, elemento):
+        self._destino()._filhos.append(elemento)
+        return elemento
+
+    def _novo_bloco(self, abrir="", fechar=""):
+        return self._adicionar(_Bloco(self._gravador, abrir, fechar))
+
+    def html(self):
+        return self._abrir + "\n".join(f.html() if isinstance(f, _Bloco) else f for f in self._filhos) + self._fechar
+
+    def __enter__(self):
+        self._gravador._pilha.append(self)
+        return self
+
+    def __exit__(self, *excecao):
+        self._gravador._pilha.pop()
+        return False
+
+    # --- Texto ---
+    def title(self, texto, **kwargs):
+        self._adicionar(f"<h1>{_md(texto, inline=True)}</h1>")
+
+    def header(self, texto, **kwargs):
+        self._adicionar(f"<h2>{_md(texto, inline=True)}</h2>")
+
+    def subheader(self, texto, **kwargs):
+        self._adicionar(f"<h3>{_md(texto, inline=True)}</h3>")
+
+    def markdown(self, texto, **kwargs):
+        self._adicionar(_md(texto))
+
+    def caption(self, texto, **kwargs):
+        self._adicionar(f'<div class="legenda">{_md(texto)}</div>')
+
+    def latex(self, formula, **kwargs):
+        self._adicionar(f'<div class="latex">{html.escape(textwrap.dedent(formula).strip())}</div>')
+
+    def code(self, codigo, language="python", **kwargs):
+        self._adicionar(f'<pre><code class="language-{language}">{html.escape(textwrap.dedent(codigo).strip())}</code></pre>')
+
+    def divider(self):
+        self._adicionar("<hr>")
+
+    def _aviso(self, tipo, texto):
+        self._adicionar(f'<div class="aviso {tipo}">{_md(texto)}</div>')
+
+    def info(self, texto, **kwargs):
+        self._aviso("info", texto)
+
+    def warning(self, texto, **kwargs):
+        self._aviso("alerta", texto)
+
+    def error(self, texto, **kwargs):
+        self._aviso("erro", texto)
+
+    def success(self, texto, **kwargs):
+        self._aviso("sucesso", texto)
+
+    def write(self, *objetos, **kwargs):
+        for objeto in objetos:
+            if isinstance(objeto, str):
+                self.markdown(objeto)
+            else:
+                self.dataframe(objeto)
+
+    def metric(self, label, value, delta=None, **kwargs):
+        variacao = f"<small>{html.escape(str(delta))}</small>" if delta is not None else ""
+        self._adicionar(f'<div class="metrica"><span>{html.escape(label)}</span><strong>{html.escape(str(value))}</strong>{variacao}</div>')
+
+    # --- Dados, gráficos e imagens ---
+    def dataframe(self, dados, hide_index=None, **kwargs):
+        if hasattr(dados, "to_pandas"):
+            dados = dados.to_pandas()
+        tabela = pd.DataFrame(dados)
+        if hide_index is None:
+            hide_index = isinstance(tabela.index, pd.RangeIndex)
+        nota = ""
+        if len(tabela) > LINHAS_MAX_TABELA:
+            nota = f'<p class="legenda">Primeiras {LINHAS_MAX_TABELA} de {len(tabela)} linhas.</p>'
+            tabela = tabela.head(LINHAS_MAX_TABELA)
+        conteudo = tabela.to_html(index=not hide_index, border=0, classes="tabela", na_rep="", float_format="{:.4g}".format)
+        self._adicionar(f'<div class="rolagem">{conteudo}</div>{nota}')
+
+    table = dataframe
+
+    def plotly_chart(self, figura, **kwargs):
+        self._gravador.usa_plotly = True
+        # "</" escapado para que um texto do gráfico não feche a tag <script>.
+        dados = figura.to_json().replace("</", "<\\/")
+        self._adicionar(f'<div class="grafico"><script type="application/json">{dados}</script></div>')
+
+    def image(self, imagem, caption=None, width=None, **kwargs):
+        src, largura = self._gravador.otimizar_imagem(imagem, width)
+        legenda = f"<figcaption>{html.escape(caption)}</figcaption>" if caption else ""
+        self._adicionar(
+            f'<figure><img src="{src}" width="{largura}" loading="lazy" alt="{html.escape(caption or "")}">{legenda}</figure>'
+        )
+
+    # --- Layout ---
+    def columns(self, spec, **kwargs):
+        pesos = [1] * spec if isinstance(spec, int) else list(spec)
+        linha = self._novo_bloco('<div class="colunas">', "</div>")
+        return [linha._novo_bloco(f'<div class="coluna" style="flex:{peso}">', "</div>") for peso in pesos]
+
+    def tabs(self, rotulos):
+        grupo = self._novo_bloco('<div class="abas">', "</div>")
+        return [grupo._novo_bloco(f'<section><h4 class="aba">{html.escape(r)}</h4>', "</section>") for r in rotulos]
+
+    def expander(self, rotulo, expanded=False, **kwargs):
+        aberto = " open" if expanded else ""
+        return self._novo_bloco(f"<details{aberto}><summary>{html.escape(rotulo)}</summary>", "</details>")
+
+    def container(self, border=False, **kwargs):
+        return self._novo_bloco(f'<div class="{"caixa" if border else "grupo"}">', "</div>")
+
+    # --- Controles: valor padrão, registrado no texto ---
+    def _parametro(self, rotulo, valor):
+        if isinstance(valor, (list, tuple)):
+            valor = ", ".join(str(v) for v in valor) if valor else "—"
+        self._adicionar(f'<p class="parametro">{html.escape(rotulo)}: <b>{html.escape(str(valor))}</b></p>')
+
+    def slider(self, label, min_value=None, max_value=None, value=None, *args, **kwargs):
+        valor = min_value if value is None else value
+        self._parametro(label, valor)
+        return valor
+
+    def select_slider(self, label, options=(), value=None, **kwargs):
+        valor = list(options)[0] if value is None else value
+        self._parametro(label, valor)
+        return valor
+
+    def selectbox(self, label, options, index=0, **kwargs):
+        valor = list(options)[index]
+        self._parametro(label, valor)
+        return valor
+
+    radio = selectbox
+
+    def multiselect(self, label, options, default=None, **kwargs):
+        valor = list(default or [])
+        self._parametro(label, valor)
+        return valor
+
+    def number_input(self, label, min_value=None, max_value=None, value=None, **kwargs):
+        valor = value if value is not None else (min_value if min_value is not None else 0.0)
+        self._parametro(label, valor)
+        return valor
+
+    def checkbox(self, label, value=False, **kwargs):
+        self._parametro(label, "sim" if value else "não")
+        return value
+
+    toggle = checkbox
+
+    def button(self, *args, **kwargs):
+        return False
+
+    def download_button(self, *args, **kwargs):
+        return False
+
+
+class Gravador(_Bloco):
+    """Substituto do módulo `streamlit` durante a exportação de uma página."""
+
+    def __init__(self, saida):
+        super().__init__(self)
+        self.saida = saida
+        self.session_state = {}
+        self.sidebar = _Bloco(self)  # O menu lateral do app não entra no site.
+        self.usa_plotly = False
+        self._pilha = [self]
+
+    def _destino(self):
+        return self._pilha[-1]
+
+    def __getattr__(self, nome):
+        raise AttributeError(f"st.{nome} não é suportado na exportação estática")
+
+    def fragment(self, funcao=None, **kwargs):
+        return funcao if funcao is not None else (lambda f: f)
+
+    def set_page_config(self, **kwargs):
+        pass
+
+    def rerun(self):
+        pass
+
+    def otimizar_imagem(self, imagem, largura):
+        """Grava a imagem reduzida em WebP em `<saida>/img` e devolve (caminho relativo, largura exibida)."""
+        if isinstance(imagem, str):
+            origem = os.path.join(RAIZ, imagem)
+            nome = os.path.splitext(os.path.basename(imagem))[0]
+            destino = os.path.join(self.saida, "img", f"{nome}-{largura or 'orig'}.webp")
+            if os.path.exists(destino) and os.path.getmtime(destino) >= os.path.getmtime(origem):
+                with Image.open(destino) as pronta:
+                    return os.path.relpath(destino, self.saida), largura or pronta.width
+            figura = Image.open(origem)
+        else:
+            figura = Image.fromarray(np.asarray(imagem))
+            nome = f"imagem-{abs(hash(figura.tobytes())):x}"
+            destino = os.path.join(self.saida, "img", f"{nome}.webp")
+
+        largura = largura or figura.width
+        if figura.width > ESCALA_IMAGEM * largura:
+            altura = round(figura.height * ESCALA_IMAGEM * largura / figura.width)
+            figura = figura.resize((ESCALA_IMAGEM * largura, altura), Image.LANCZOS)
+        if figura.mode not in ("RGB", "RGBA"):
+            figura = figura.convert("RGBA")
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        figura.save(destino, "WEBP", quality=QUALIDADE_WEBP, method=6)
+        return os.path.relpath(destino, self.saida), largura
+
+
+@contextmanager
+def _gravando(gravador):
+    # As seções usam o `st` global de `arquivos`; durante a exportação, ele aponta para o gravador.
+    original = arquivos.st
+    arquivos.st = gravador
+    try:
+        yield gravador
+    finally:
+        arquivos.st = original
+
+
+def arquivo_pagina(pagina):
+    """Nome do arquivo HTML de uma página do menu (a primeira é `index.html`)."""
+    if pagina == next(iter(arquivos.PAGINAS)):
+        return "index.html"
+    ascii_ = unicodedata.normalize("NFKD", pagina).encode("ascii", "ignore").decode()
+    return "-".join(ascii_.lower().split()) + ".html"
+
+
+def _link_app(pagina, secao, url_app):
+    return (
+        f'<div class="aviso interativa"><p>{html.escape(arquivos.INTERATIVAS[secao])}</p>'
+        f'<a href="{html.escape(url_app)}/?pagina={quote(pagina)}">Abrir a simulação interativa no app ↗</a></div>'
+    )
+
+
+ESTILO = """
+body{margin:0;font-family:system-ui,-apple-system,"Segoe UI",Roboto,sans-serif;color:#262730;line-height:1.6;display:flex}
+nav{width:230px;min-height:100vh;background:#f0f2f6;padding:1.5rem 1rem;box-sizing:border-box;flex-shrink:0}
+nav a{display:block;padding:.35rem .6rem;border-radius:.4rem;color:#262730;text-decoration:none}
+nav a.atual{background:#ff4b4b;color:#fff}
+main{flex:1;max-width:1100px;padding:2rem 3rem;box-sizing:border-box;min-width:0}
+img{max-width:100%;height:auto}figure{margin:1rem 0}figcaption,.legenda{color:#808495;font-size:.875rem}
+.colunas{display:flex;gap:2rem;flex-wrap:wrap}.coluna{min-width:260px}
+.aviso{padding:.75rem 1rem;border-radius:.5rem;margin:1rem 0}
+.info{background:#e8f0fe}.alerta{background:#fffbe6}.erro{background:#ffeded}.sucesso{background:#e8f9ee}.interativa{background:#f0f2f6}
+.caixa{border:1px solid #e6e9ef;border-radius:.5rem;padding:1rem;margin:.5rem 0}
+details{border:1px solid #e6e9ef;border-radius:.5rem;padding:.5rem 1rem;margin:.75rem 0}summary{cursor:pointer;font-weight:600}
+.metrica{display:inline-block;margin:.5rem 2rem .5rem 0}.metrica span{display:block;font-size:.875rem}.metrica strong{font-size:2rem}
+.parametro{color:#808495;font-size:.875rem;margin:.25rem 0}
+.rolagem{overflow-x:auto}.tabela{border-collapse:collapse;font-size:.875rem}.tabela td,.tabela th{border-bottom:1px solid #e6e9ef;padding:.25rem .75rem;text-align:right}
+pre{background:#f0f2f6;padding:1rem;border-radius:.5rem;overflow-x:auto}
+.grafico{min-height:450px}
+"""
+
+# Markdown e fórmulas são renderizados no navegador; as fórmulas são separadas antes do
+# Markdown para que `_` e `*` dentro delas não virem ênfase.
+SCRIPT = r"""
+function formulas(texto, lista) {
+  return texto.replace(/\$\$[\s\S]+?\$\$|\$(?!\s)[^$\n]+?(?<!\s)\$/g, m => { lista.push(m); return `@@F${lista.length - 1}@@`; });
+}
+function restaurar(html, lista) {
+  return html.replace(/@@F(\d+)@@/g, (_, i) => {
+    const f = lista[i], bloco = f.startsWith('$$');
+    return katex.renderToString(f.slice(bloco ? 2 : 1, bloco ? -2 : -1), {displayMode: bloco, throwOnError: false});
+  });
+}
+for (const el of document.querySelectorAll('.md, .md-inline')) {
+  const lista = [];
+  const texto = formulas(el.textContent, lista);
+  el.innerHTML = restaurar(el.classList.contains('md-inline') ? marked.parseInline(texto) : marked.parse(texto), lista);
+}
+for (const el of document.querySelectorAll('.latex')) {
+  katex.render(el.textContent, el, {displayMode: true, throwOnError: false});
+}
+for (const el of document.querySelectorAll('.grafico')) {
+  const fig = JSON.parse(el.querySelector('script').textContent);
+  Plotly.newPlot(el, fig.data, fig.layout, {responsive: true});
+}
+"""
+
+
+ATUAL = ' class="atual"'
+
+
+def _documento(pagina, corpo, usa_plotly, url_app):
+    menu = "\n".join(
+        f'<a href="{arquivo_pagina(p)}"{ATUAL if p == pagina else ""}>{html.escape(p)}</a>'
+        for p in arquivos.PAGINAS
+    )
+    scripts = [CDN["marked"], CDN["katex"]] + ([CDN["plotly"]] if usa_plotly else [])
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(pagina)} · BESS</title>
+<link rel="stylesheet" href="{CDN["katex_css"]}">
+<style>{ESTILO}</style>
+</head>
+<body>
+<nav><strong>🔋 BESS</strong>
+{menu}
+<p class="legenda"><a href="{html.escape(url_app)}/?pagina={quote(pagina)}">Versão interativa ↗</a></p>
+</nav>
+<main>
+<div class="md">**Autor:** `{html.escape(AUTOR)}`</div>
+<hr>
+{corpo}
+<hr>
+<p class="legenda">Versão estática gerada em {datetime.now():%d/%m/%Y %H:%M}.</p>
+</main>
+{"".join(f'<script src="{s}"></script>' for s in scripts)}
+<script>{SCRIPT}</script>
+</body>
+</html>
+"""
+
+
+def exportar_pagina(pagina, saida, url_app=URL_APP):
+    """
+    Renderiza uma página do menu em HTML estático.
+
+    Returns:
+    - str: Caminho do arquivo gerado.
+    """
+    gravador = Gravador(saida)
+    with _gravando(gravador):
+        for secao in arquivos.PAGINAS[pagina]:
+            if secao in arquivos.INTERATIVAS:
+                gravador._adicionar(_link_app(pagina, secao, url_app))
+            else:
+                secao()
+    caminho = os.path.join(saida, arquivo_pagina(pagina))
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.write(_documento(pagina, gravador.html(), gravador.usa_plotly, url_app))
+    return caminho
+
+
+def exportar(saida="site", url_app=URL_APP, paginas=None):
+    """
+    Exporta as páginas do menu (padrão: todas) para `saida`.
+
+    Returns:
+    - list[str]: Arquivos HTML gerados.
+    """
+    os.makedirs(saida, exist_ok=True)
+    return [exportar_pagina(pagina, saida, url_app) for pagina in (paginas or arquivos.PAGINAS)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta o app para um site estático.")
+    parser.add_argument("--saida", default="site", help="Diretório de saída (padrão: site).")
+    parser.add_argument("--url-app", default=URL_APP, help="Endereço do app ao vivo, usado nos links das simulações.")
+    parser.add_argument("--paginas", nargs="+", choices=list(arquivos.PAGINAS), help="Exporta só estas páginas.")
+    args = parser.parse_args(argv)
+
+    for caminho in exportar(args.saida, args.url_app.rstrip("/"), args.paginas):
+        print(f"  {caminho} ({os.path.getsize(caminho) / 1024:.0f} KB)")
+    imagens = os.path.join(args.saida, "img")
+    if os.path.isdir(imagens):
+        total = sum(os.path.getsize(os.path.join(imagens, f)) for f in os.listdir(imagens))
+        print(f"  {imagens}/ ({total / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Testes do serviço local, sem rede, pelo `ClienteLocal`."""
+import asyncio
+import unittest
+
+import numpy as np
+
+from bess import cache_resultados, servico, simulacao
+
+
+DEMANDA = (150 + 100 * np.sin(np.arange(48) / 24 * 2 * np.pi)).tolist()
+
+
+class TestServicoLocal(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        armazem = cache_resultados.ArmazemResultados(diretorio=None)
+        self.servico = servico.ServicoSimulacao(max_trabalhadores=2, janela_lote_s=0.05, armazem=armazem)
+        self.cliente = servico.ClienteLocal(self.servico)
+
+    async def asyncTearDown(self):
+        self.servico.encerrar()
+
+    async def test_pedidos_simultaneos_viram_um_lote(self):
+        potencias = [20.0, 40.0, 60.0, 80.0]
+        respostas = await asyncio.gather(*(
+            self.cliente.peak_shaving(DEMANDA, potencia_mw=p, energia_mwh=100.0, limiar_mw=200.0) for p in potencias
+        ))
+        self.assertEqual(self.servico.estatisticas['lotes'], 1)
+        self.assertEqual(self.servico.estatisticas['pedidos_em_lote'], len(potencias))
+        for p, (status, resposta) in zip(potencias, respostas):
+            self.assertEqual(status, 200)
+            rede, _, soc = simulacao.despachar(DEMANDA, p, 100.0, 0.9, 200.0)
+            np.testing.assert_allclose(resposta['rede_mw'], rede[0])
+            np.testing.assert_allclose(resposta['soc'], soc[0])
+
+    async def test_soc_agrupa_series_do_mesmo_tamanho(self):
+        rng = np.random.default_rng(0)
+        series = [rng.normal(0, 10, n).tolist() for n in (24, 24, 12)]
+        respostas = await asyncio.gather(*(
+            self.cliente.soc(p, capacidade_mwh=50.0 + i) for i, p in enumerate(series)
+        ))
+        self.assertEqual(self.servico.estatisticas['lotes'], 2)
+        for i, (p, (status, resposta)) in enumerate(zip(series, respostas)):
+            self.assertEqual(status, 200)
+            np.testing.assert_allclose(resposta['soc'], simulacao.simular_soc(p, 50.0 + i))
+
+    async def test_pedido_repetido_vem_do_cache(self):
+        corpo = {'potencia': [10.0, -5.0, 20.0], 'capacidade_mwh': 50.0}
+        primeira = await self.cliente.chamar('/soc', corpo)
+        await asyncio.sleep(0.05)  # Deixa a gravação no cache terminar.
+        segunda = await self.cliente.chamar('/soc', corpo)
+        self.assertEqual(primeira, segunda)
+        self.assertEqual(self.servico.estatisticas['acertos_cache'], 1)
+        self.assertEqual(self.servico.estatisticas['lotes'], 1)
+
+    async def test_pedidos_identicos_compartilham_o_calculo(self):
+        corpo = {'potencia': [1.0, 2.0, 3.0], 'capacidade_mwh': 10.0}
+        respostas = await asyncio.gather(*(self.cliente.chamar('/soc', corpo) for _ in range(3)))
+        self.assertEqual(len({str(r) for r in respostas}), 1)
+        self.assertEqual(self.servico.estatisticas['compartilhadas'], 2)
+        self.assertEqual(self.servico.estatisticas['pedidos_em_lote'], 1)
+
+    async def test_erros_de_requisicao(self):
+        invalidos = [
+            {'potencia': [1.0, 2.0]},
+            {'potencia': [1.0, 2.0], 'capacidade_mwh': 50.0, 'eficiencia': 0},
+            {'potencia': [1.0, 2.0], 'capacidade_mwh': 50.0, 'eficiencia': float('nan')},
+            {'potencia': [1.0, 2.0], 'capacidade_mwh': -1.0},
+            {'potencia': 'a', 'capacidade_mwh': 50.0},
+            {'potencia': [], 'capacidade_mwh': 50.0},
+        ]
+        for corpo in invalidos:
+            status, resposta = await self.cliente.chamar('/soc', corpo)
+            self.assertEqual(status, 400, corpo)
+            self.assertIn('erro', resposta)
+        status, _ = await self.cliente.peak_shaving(DEMANDA, potencia_mw=-10.0, energia_mwh=100.0)
+        self.assertEqual(status, 400)
+        self.assertEqual((await self.cliente.chamar('/inexistente', {}))[0], 404)
+        self.assertEqual((await self.cliente.chamar('/soc', metodo='GET'))[0], 405)
+        self.assertEqual(self.servico.estatisticas['lotes'], 0)
+
+
+class TestServicoHttp(unittest.IsolatedAsyncioTestCase):
+
+    async def test_content_length_invalido(self):
+        armazem = cache_resultados.ArmazemResultados(diretorio=None)
+        svc = servico.ServicoSimulacao(max_trabalhadores=1, armazem=armazem)
+        servidor = await servico.iniciar(svc, porta=0)
+        porta = servidor.sockets[0].getsockname()[1]
+        try:
+            for valor in ("abc", "-5"):
+                leitor, escritor = await asyncio.open_connection("127.0.0.1", porta)
+                escritor.write(f"POST /soc HTTP/1.1\r\nContent-Length: {valor}\r\n\r\n".encode())
+                await escritor.drain()
+                self.assertTrue((await leitor.readline()).startswith(b"HTTP/1.1 400"))
+                escritor.close()
+        finally:
+            servidor.close()
+            await servidor.wait_closed()
+            svc.encerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()